@@ -1,29 +1,41 @@
 from PySide6.QtWidgets import QMainWindow, QApplication, QHBoxLayout, QWidget
-from PySide6.QtCore import QThread
+from PySide6.QtCore import QThread, Qt
 
 from src.widgets.radar import RadarScopeGL
 from src.widgets.radar.ADSBSocketWorker import ADSBSocketWorker
+from src.widgets.radar.ConflictDetector import ConflictDetector
+from src.widgets.radar.CoverageStats import CoverageStats
 
 from src.widgets.plane_list.PlaneList import PlaneList
 from src.utils.gps import get_gps_location
+from src.utils.settings import Settings, SettingsWatcher, load_settings
+from src.utils.stream_server import create_stream_server
+
+# Sections only read at startup
+RESTART_SECTIONS = {"gps", "coverage", "stream", "aircraft_db"}
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, settings: Settings):
         super().__init__()
+        self.settings = settings
         self.container = QWidget()
         self.setCentralWidget(self.container)
         layout = QHBoxLayout(self.container)
 
-        lat, lon = get_gps_location()
+        lat, lon = get_gps_location(settings.gps)
         print(f"GPS position locked: {lat}, {lon}")
 
-        self.radar = RadarScopeGL(lat, lon)
+        self.radar = RadarScopeGL(lat, lon, settings)
         self.plane_list = PlaneList()
         layout.addWidget(self.radar)
         layout.addWidget(self.plane_list)
 
-        self.worker = ADSBSocketWorker()
+        self.worker = ADSBSocketWorker(settings,
+                                       conflicts=ConflictDetector(lat, lon, settings.conflict),
+                                       origin=(lat, lon),
+                                       wait_for_ack=True,
+                                       coverage=CoverageStats(lat, lon, settings.coverage))
         self.worker_thread = QThread()
         self.worker.moveToThread(self.worker_thread)
 
@@ -31,18 +43,57 @@ class MainWindow(QMainWindow):
         self.worker.planes_updated.connect(self.radar.handle_socket_update)
         self.worker.planes_updated.connect(
             self.plane_list.handle_socket_update)
+        self.worker.conflicts_updated.connect(
+            self.radar.handle_conflict_update)
+        self.worker.conflicts_updated.connect(
+            self.plane_list.handle_conflict_update)
+        self.worker.coverage_updated.connect(self.radar.handle_coverage_update)
+        self.worker.ingest_stats.connect(self.plane_list.handle_ingest_stats)
+        # Connected last, so it runs once both views have redrawn
+        self.worker.planes_updated.connect(self.acknowledge_planes)
         self.worker_thread.finished.connect(self.worker_thread.deleteLater)
+
+        # Runs in the worker thread and only stores the latest table
+        self.stream = create_stream_server(settings.stream)
+        if self.stream:
+            self.worker.planes_updated.connect(
+                self.stream.publish, Qt.ConnectionType.DirectConnection)
+            self.stream.start()
+
+        # Queued into the worker thread, picked up between batches
+        self.watcher = SettingsWatcher(settings)
+        self.watcher.settings_changed.connect(self.apply_settings)
+        self.watcher.settings_changed.connect(self.radar.apply_settings)
+        self.watcher.settings_changed.connect(self.worker.apply_settings)
+
         self.worker_thread.start()
 
+    def apply_settings(self, settings: Settings):
+        restart = settings.changed_sections(self.settings) & RESTART_SECTIONS
+        if restart:
+            print("Restart to apply changes to: "
+                  + ", ".join(sorted(s.upper() for s in restart)))
+        self.settings = settings
+
+    def acknowledge_planes(self, _planes):
+        self.worker.acknowledge()
+
     def closeEvent(self, event):
         self.worker.stop()
         self.worker_thread.quit()
         self.worker_thread.wait()
+        if self.stream:
+            self.stream.stop()
         super().closeEvent(event)
 
 
 if __name__ == "__main__":
+    try:
+        settings = load_settings()
+    except ValueError as e:
+        raise SystemExit(f"Invalid config.ini: {e}")
+
     app = QApplication([])
-    main = MainWindow()
+    main = MainWindow(settings)
     main.show()
     app.exec()
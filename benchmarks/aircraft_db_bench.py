@@ -0,0 +1,65 @@
+"""Import and lookup timings for the offline aircraft database.
+
+Run from the repository root: python -m benchmarks.aircraft_db_bench [rows]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.utils.aircraft_db import AircraftDatabase, import_csv
+
+
+def write_csv(path: str, rows: int) -> list[str]:
+    idents = random.sample(range(1 << 24), rows)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("icao24,registration,typecode,operator\n")
+        for icao in idents:
+            f.write(f"{icao:06x},N{icao % 99999},B738,Operator {icao % 500}\n")
+    return [f"{icao:06x}" for icao in idents]
+
+
+def main(rows: int = 500_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "aircraft.csv")
+        db_path = os.path.join(tmp, "aircraft.db")
+        idents = write_csv(csv_path, rows)
+
+        start = time.perf_counter()
+        count = import_csv(csv_path, db_path)
+        elapsed = time.perf_counter() - start
+        print(f"import:  {count} rows in {elapsed:.2f}s "
+              f"({os.path.getsize(db_path) / 1e6:.1f} MB)")
+
+        db = AircraftDatabase(db_path)
+        queries = random.choices(idents, k=50_000)
+        misses = [f"{random.getrandbits(24):06x}" for _ in range(10_000)]
+
+        start = time.perf_counter()
+        for hex_id in queries:
+            db._lookup(hex_id)
+        elapsed = time.perf_counter() - start
+        print(f"uncached lookup: {elapsed / len(queries) * 1e6:.1f} us")
+
+        start = time.perf_counter()
+        for hex_id in misses:
+            db._lookup(hex_id)
+        elapsed = time.perf_counter() - start
+        print(f"uncached miss:   {elapsed / len(misses) * 1e6:.1f} us")
+
+        # A receiver sees a few hundred airframes at a time
+        working_set = idents[:500]
+        for hex_id in working_set:
+            db.lookup(hex_id)
+        start = time.perf_counter()
+        for hex_id in random.choices(working_set, k=50_000):
+            db.lookup(hex_id)
+        elapsed = time.perf_counter() - start
+        print(f"cached lookup:   {elapsed / 50_000 * 1e6:.2f} us")
+
+        del db
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
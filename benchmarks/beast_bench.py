@@ -0,0 +1,81 @@
+"""Ingest throughput of the Beast decoder against the SBS text path.
+
+Both streams carry the same identification, position and velocity messages
+for a fleet of synthetic aircraft. Run from the repository root:
+python -m benchmarks.beast_bench [messages]
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.utils.settings import Settings, SocketSettings
+from src.widgets.radar.ADSBSocketWorker import ADSBSocketWorker
+from src.widgets.radar.BeastDecoder import BeastDecoder, mode_s_crc
+
+AIRCRAFT = 300
+STAMP = "2025/01/01,12:00:00.000,2025/01/01,12:00:00.000"
+
+# ME fields of well known example frames (KLM1023, 38000 ft, 159 kt)
+IDENT = "202CC371C32CE0"
+EVEN = "58C382D690C8AC"
+ODD = "58C386435CC412"
+VELOCITY = "99440994083817"
+
+
+def beast_frame(icao: int, me: str) -> bytes:
+    msg = bytearray(bytes.fromhex(f"8D{icao:06X}{me}000000"))
+    parity = int(mode_s_crc(np.frombuffer(bytes(msg), dtype=np.uint8)[None, :])[0])
+    msg[11:] = parity.to_bytes(3, "big")
+    body = bytes(6) + b"\x80" + bytes(msg)
+    return b"\x1a\x33" + body.replace(b"\x1a", b"\x1a\x1a")
+
+
+def sbs_lines(icao: int) -> list[str]:
+    hex_id = f"{icao:06X}"
+    return [
+        f"MSG,1,1,1,{hex_id},1,{STAMP},KLM1023,,,,,,,,,,,",
+        f"MSG,3,1,1,{hex_id},1,{STAMP},,38000,,,52.25720,3.91937,,,0,0,0,0",
+        f"MSG,3,1,1,{hex_id},1,{STAMP},,38000,,,52.25720,3.91937,,,0,0,0,0",
+        f"MSG,4,1,1,{hex_id},1,{STAMP},,,159,183,,,-832,,,,,0",
+    ]
+
+
+def build_streams(messages: int) -> tuple[bytes, list[str]]:
+    frames, lines = [], []
+    icaos = [0x400000 + i for i in range(AIRCRAFT)]
+    while len(lines) < messages:
+        for icao in icaos:
+            frames += [beast_frame(icao, me) for me in (IDENT, EVEN, ODD, VELOCITY)]
+            lines += sbs_lines(icao)
+    return b"".join(frames), lines
+
+
+def report(name: str, count: int, elapsed: float):
+    print(f"{name:<16} {count / elapsed:>12,.0f} msg/s")
+
+
+def main(messages: int = 200_000):
+    beast, lines = build_streams(messages)
+    chunks = [beast[i:i + 16384] for i in range(0, len(beast), 16384)]
+
+    decoder = BeastDecoder()
+    start = time.perf_counter()
+    decoded = sum(len(decoder.feed(chunk)) for chunk in chunks)
+    report("beast decode", decoded, time.perf_counter() - start)
+
+    worker = ADSBSocketWorker(Settings(socket=SocketSettings(format="beast")))
+    start = time.perf_counter()
+    for chunk in chunks:
+        worker.handle_frames(chunk)
+    report("beast worker", decoded, time.perf_counter() - start)
+
+    worker = ADSBSocketWorker(Settings(socket=SocketSettings(format="sbs")))
+    start = time.perf_counter()
+    for line in lines:
+        worker.handle_line(line)
+    report("sbs worker", len(lines), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -1,4 +1,3 @@
-import configparser
 from dataclasses import dataclass
 from typing import Callable
 
@@ -14,6 +13,8 @@ from OpenGL.GL import (glEnable, glBlendFunc, glViewport, glClearColor,
 from OpenGL.GL import (GL_BLEND, GL_LINE_SMOOTH, GL_COLOR_BUFFER_BIT,
                        GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_FALSE)
 
+from src.utils.settings import GuiSettings
+
 
 VERTEX_SHADER = """
 #version 330 core
@@ -37,10 +38,6 @@ void main() {
 }
 """
 
-config = configparser.ConfigParser()
-config.read('config.ini')
-
-
 @dataclass
 class Drawable:
     draw_func: Callable[..., None]
@@ -81,19 +78,23 @@ class BaseOpenGLWidget(QOpenGLWidget):
     timer: QTimer | None = None
     last_time: int
 
-    def __init__(self, min_width=400, min_height=400, animated=False):
+    def __init__(self, min_width=400, min_height=400, animated=False,
+                 gui: GuiSettings = GuiSettings()):
         super().__init__()
         self.setMinimumSize(min_width, min_height)
         self.projection = QMatrix4x4()
+        self.gui = gui
 
         self.static_layer = Layer()
         self.dynamic_layer = Layer()
+        self._static_dirty = False
 
         self._model_matrix = QMatrix4x4()
         self._model_data = np.zeros(16, dtype=np.float32)
 
-        # Text rendering
+        # Text rendering, fonts are shared between labels
         self.texts: list[dict] = []
+        self._fonts: dict[tuple[str, int], QFont] = {}
 
         # Timer for animations if needed
         if animated:
@@ -102,7 +103,19 @@ class BaseOpenGLWidget(QOpenGLWidget):
             self.last_time = 0
             self.timer = QTimer()
             self.timer.timeout.connect(self._tick)
-            self.timer.start(1000 // config.getint('GUI', 'fps'))
+            self.timer.start(1000 // gui.fps)
+
+    def apply_gui(self, gui: GuiSettings):
+        """Switch frame rate and default font without recreating the widget"""
+        if self.timer and gui.fps != self.gui.fps:
+            self.timer.setInterval(1000 // gui.fps)
+        self.gui = gui
+        self._fonts.clear()
+
+    def invalidate_static_layer(self):
+        """Rebuild the static layer before the next frame is drawn"""
+        self._static_dirty = True
+        self.update()
 
     def initializeGL(self) -> None:
         glClearColor(0.0, 0.0, 0.0, 1.0)
@@ -138,6 +151,11 @@ class BaseOpenGLWidget(QOpenGLWidget):
         if not self.shader:
             return
 
+        if self._static_dirty:
+            self._static_dirty = False
+            self.static_layer.clear()
+            self.init_static_layer()
+
         glClear(GL_COLOR_BUFFER_BIT)
         self.shader.bind()
         self.set_projection(self.projection)
@@ -231,8 +249,8 @@ class BaseOpenGLWidget(QOpenGLWidget):
 
     def add_text(self, text: str, x: float, y: float,
                  color: tuple = (0, 230, 230),
-                 size: int = config.getint("GUI", "font_size"),
-                 font: str = config.get("GUI", "font"),
+                 size: int | None = None,
+                 font: str | None = None,
                  z_order: int = 0,
                  align: Qt.AlignmentFlag = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop):
         self.texts.append({
@@ -241,10 +259,16 @@ class BaseOpenGLWidget(QOpenGLWidget):
             "y": y,
             "color": color,
             "align": align,
-            "font": QFont(font, size),
+            "font": self._font(font or self.gui.font, size or self.gui.font_size),
             "z_order": z_order,
         })
 
+    def _font(self, family: str, size: int) -> QFont:
+        key = (family, size)
+        if key not in self._fonts:
+            self._fonts[key] = QFont(family, size)
+        return self._fonts[key]
+
     def clear_texts(self): self.texts.clear()
 
     def init_geometry(self): raise NotImplementedError
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+import mapbox_earcut as earcut
+
+from OpenGL.GL import GL_LINES, GL_TRIANGLES
+
+from src.gl.GLGeometry import GLGeometry
+from src.utils.settings import MapSettings
+
+CACHE_VERSION = 1
+
+# Douglas-Peucker tolerances in degrees, finest first
+LOD_TOLERANCES = (0.0, 0.0002, 0.0008, 0.0032, 0.0128)
+
+# Vertices are stored relative to the origin snapped to this grid, so GPS
+# jitter between runs doesn't invalidate the cache
+ANCHOR_STEP = 0.05
+
+
+def simplify(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Douglas-Peucker simplification of a polyline
+
+    Args:
+        points (np.ndarray): (N, 2) array of vertices
+        tolerance (float): Maximum distance a removed vertex may deviate
+
+    Returns:
+        np.ndarray: The retained vertices, endpoints always included
+    """
+    if tolerance <= 0 or len(points) < 3:
+        return points
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        if end <= start + 1:
+            continue
+
+        seg = points[end] - points[start]
+        rel = points[start + 1:end] - points[start]
+        length = np.hypot(*seg)
+        if length == 0:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / length
+
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack += [(start, split), (split, end)]
+
+    return points[keep]
+
+
+def _geometries(obj: dict):
+    """Yield bare geometry objects from any GeoJSON object"""
+    kind = obj.get('type')
+    if kind == 'FeatureCollection':
+        for feature in obj.get('features', []):
+            yield from _geometries(feature)
+    elif kind == 'Feature':
+        if obj.get('geometry'):
+            yield from _geometries(obj['geometry'])
+    elif kind == 'GeometryCollection':
+        for geometry in obj.get('geometries', []):
+            yield from _geometries(geometry)
+    else:
+        yield obj
+
+
+def _shapes(path: str, anchor: tuple[float, float]):
+    """Yield ('line', [ring]) and ('polygon', [outer, *holes]) in local degrees"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    offset = np.array([anchor[1], anchor[0]])  # GeoJSON is lon, lat
+
+    def ring(coords):
+        return np.asarray(coords, dtype=np.float64)[:, :2] - offset
+
+    for geometry in _geometries(data):
+        kind, coords = geometry.get('type'), geometry.get('coordinates')
+        if not coords:
+            continue
+        if kind == 'LineString':
+            yield 'line', [ring(coords)]
+        elif kind == 'MultiLineString':
+            for line in coords:
+                yield 'line', [ring(line)]
+        elif kind == 'Polygon':
+            yield 'polygon', [ring(r) for r in coords]
+        elif kind == 'MultiPolygon':
+            for polygon in coords:
+                yield 'polygon', [ring(r) for r in polygon]
+
+
+def _segments(points: np.ndarray) -> np.ndarray:
+    """Polyline to GL_LINES vertex pairs, so many lines share one buffer"""
+    pairs = np.empty((2 * (len(points) - 1), 2), dtype=np.float32)
+    pairs[0::2], pairs[1::2] = points[:-1], points[1:]
+    return pairs
+
+
+def _triangles(rings: list[np.ndarray]) -> np.ndarray:
+    vertices = np.concatenate(rings)
+    ends = np.cumsum([len(r) for r in rings]).astype(np.uint32)
+    indices = earcut.triangulate_float64(vertices, ends)
+    return vertices[indices].astype(np.float32)
+
+
+def tessellate(path: str, anchor: tuple[float, float], filled: bool) -> dict[str, np.ndarray]:
+    """Project, simplify and tessellate one GeoJSON file at every LOD level"""
+    shapes = list(_shapes(path, anchor))
+    arrays = {}
+
+    for level, tolerance in enumerate(LOD_TOLERANCES):
+        lines, triangles = [], []
+        for kind, rings in shapes:
+            rings = [simplify(r, tolerance) for r in rings]
+            lines += [_segments(r) for r in rings if len(r) >= 2]
+
+            if filled and kind == 'polygon':
+                # Drop the closing vertex earcut doesn't want, and any
+                # ring simplified away to nothing
+                rings = [r[:-1] if len(r) > 1 and np.array_equal(r[0], r[-1]) else r
+                         for r in rings]
+                if len(rings[0]) < 3:
+                    continue
+                triangles.append(_triangles([r for r in rings if len(r) >= 3]))
+
+        arrays[f'lines{level}'] = (np.concatenate(lines) if lines
+                                   else np.empty((0, 2), dtype=np.float32))
+        arrays[f'triangles{level}'] = (np.concatenate(triangles) if triangles
+                                       else np.empty((0, 2), dtype=np.float32))
+    return arrays
+
+
+def _cache_key(path: str, anchor: tuple[float, float], filled: bool) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(f"{anchor[0]:.4f},{anchor[1]:.4f},{filled},"
+                  f"{LOD_TOLERANCES},{CACHE_VERSION}".encode())
+    return digest.hexdigest()
+
+
+class MapLayer:
+    """Static map overlay from local GeoJSON files.
+
+    Each file is projected and tessellated once per origin and cached as
+    an .npz of vertex arrays. Everything is merged into one line buffer and
+    one triangle buffer per level of detail, so the overlay costs at most
+    two draw calls whatever the number of features.
+    """
+
+    def __init__(self, lat: float, lon: float,
+                 settings: MapSettings = MapSettings()):
+        self.anchor = (round(lat / ANCHOR_STEP) * ANCHOR_STEP,
+                       round(lon / ANCHOR_STEP) * ANCHOR_STEP)
+        self.settings = settings
+        self.cache_dir = settings.cache
+
+        self.lines: list[np.ndarray] = []
+        self.triangles: list[np.ndarray] = []
+        self._geometry: dict[tuple[str, int], GLGeometry] = {}
+
+    @property
+    def empty(self) -> bool:
+        return not self.lines
+
+    def load(self) -> None:
+        """Build the merged vertex arrays, reusing the on-disk cache"""
+        sources = ([(p, False) for p in self.settings.files] +
+                   [(p, True) for p in self.settings.filled])
+
+        per_file = []
+        for path, fill in sources:
+            if not os.path.exists(path):
+                print(f"Map file not found: {path}")
+                continue
+
+            try:
+                per_file.append(self._load_cached(path, fill))
+            except Exception as e:
+                print(f"Skipping map file {path}: {e!r}")
+
+        if not per_file:
+            return
+
+        for level in range(len(LOD_TOLERANCES)):
+            self.lines.append(np.concatenate(
+                [a[f'lines{level}'] for a in per_file]))
+            self.triangles.append(np.concatenate(
+                [a[f'triangles{level}'] for a in per_file]))
+
+    def _load_cached(self, path: str, filled: bool) -> dict[str, np.ndarray]:
+        cache_path = os.path.join(
+            self.cache_dir, _cache_key(path, self.anchor, filled) + '.npz')
+
+        if os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as cached:
+                    return {name: cached[name] for name in cached.files}
+            except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+                print(f"Ignoring map cache {cache_path}: {e}")
+
+        arrays = tessellate(path, self.anchor, filled)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp.npz'
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, cache_path)
+        return arrays
+
+    @staticmethod
+    def level_for(radius: float) -> int:
+        """Coarsest level that stays under about half a pixel at this radius"""
+        target = radius / 600
+        return max(i for i, t in enumerate(LOD_TOLERANCES) if t <= target)
+
+    def geometry(self, kind: str, level: int) -> GLGeometry | None:
+        """Lazily upload a merged buffer; needs a current GL context"""
+        key = (kind, level)
+        if key not in self._geometry:
+            vertices = (self.lines if kind == 'lines' else self.triangles)[level]
+            if not len(vertices):
+                return None
+            self._geometry[key] = GLGeometry(
+                vertices.flatten(), GL_LINES if kind == 'lines' else GL_TRIANGLES)
+        return self._geometry[key]
+
+    def destroy(self) -> None:
+        """Free the uploaded buffers; needs a current GL context"""
+        for geometry in self._geometry.values():
+            geometry.destroy()
+        self._geometry.clear()
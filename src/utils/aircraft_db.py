@@ -0,0 +1,162 @@
+import csv
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from src.utils.settings import AircraftDbSettings
+
+# File layout: header, sorted uint32 ICAO keys, then fixed width records in
+# the same order. Keys are contiguous so a binary search only touches a
+# handful of pages of the mapping.
+MAGIC = b"ACDB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")  # magic, version, reserved, count
+
+RECORD_DTYPE = np.dtype([
+    ("registration", "S12"),
+    ("type", "S4"),
+    ("operator", "S48"),
+])
+
+
+@dataclass(frozen=True)
+class AircraftInfo:
+    registration: str | None
+    aircraftType: str | None
+    operator: str | None
+
+
+def _text(value: bytes) -> str | None:
+    return value.decode("utf-8", errors="ignore").strip() or None
+
+
+def import_csv(csv_path: str, db_path: str) -> int:
+    """Convert an aircraft CSV dump into the sorted binary database.
+
+    The header row must contain `icao24` and may contain `registration`,
+    `typecode` and `operator` (or `operatoricao`), as in the OpenSky
+    aircraft database.
+
+    Args:
+        csv_path (str): Source CSV file
+        db_path (str): Destination database file, replaced atomically
+
+    Returns:
+        int: Number of aircraft written
+
+    Raises:
+        ValueError: If no row has a valid `icao24`
+    """
+    keys, registrations, types, operators = [], [], [], []
+
+    with open(csv_path, newline="", encoding="utf-8", errors="replace") as f:
+        # Newer OpenSky dumps quote every field with ' rather than "
+        quote = "'" if f.read(1) == "'" else '"'
+        f.seek(0)
+        reader = csv.DictReader(f, quotechar=quote)
+        for row in reader:
+            try:
+                icao = int(row.get("icao24") or "", 16)
+            except ValueError:
+                continue
+            if not 0 <= icao < 1 << 24:
+                continue
+
+            keys.append(icao)
+            registrations.append((row.get("registration") or "").encode())
+            types.append((row.get("typecode") or "").encode())
+            operators.append((row.get("operator")
+                              or row.get("operatoricao") or "").encode())
+
+    if not keys:
+        raise ValueError(f"{csv_path} has no rows with a valid icao24")
+
+    key_array = np.array(keys, dtype=np.uint32)
+    records = np.empty(len(keys), dtype=RECORD_DTYPE)
+    records["registration"] = registrations
+    records["type"] = types
+    records["operator"] = operators
+
+    # Later rows win when a dump lists the same airframe twice
+    order = np.argsort(key_array, kind="stable")
+    key_array, records = key_array[order], records[order]
+    last = np.append(key_array[1:] != key_array[:-1], True)
+    key_array, records = key_array[last], records[last]
+
+    tmp_path = db_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(key_array)))
+        f.write(key_array.tobytes())
+        f.write(records.tobytes())
+    os.replace(tmp_path, db_path)
+
+    return len(key_array)
+
+
+class AircraftDatabase:
+    """Read-only, memory-mapped view of a database built by `import_csv`"""
+
+    def __init__(self, path: str, cache_size: int = 4096):
+        with open(path, "rb") as f:
+            magic, version, _, count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not an aircraft database")
+
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.count = count
+        self._keys = np.frombuffer(self._mmap, dtype=np.uint32,
+                                   count=count, offset=HEADER.size)
+        self._records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE,
+                                      count=count, offset=HEADER.size + 4 * count)
+
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _lookup(self, hex_id: str) -> AircraftInfo | None:
+        try:
+            icao = int(hex_id, 16)
+        except ValueError:
+            return None
+
+        if not 0 <= icao < 1 << 24:
+            return None
+
+        # Search with a matching dtype so NumPy doesn't upcast the whole array
+        i = int(np.searchsorted(self._keys, np.uint32(icao)))
+        if i >= self.count or self._keys[i] != icao:
+            return None
+
+        record = self._records[i]
+        return AircraftInfo(_text(record["registration"]),
+                            _text(record["type"]),
+                            _text(record["operator"]))
+
+
+def load_aircraft_database(settings: AircraftDbSettings) -> AircraftDatabase | None:
+    """Open the configured database, importing the CSV dump on first use"""
+    db_path, csv_path = settings.path, settings.csv
+
+    if not db_path:
+        return None
+
+    if not os.path.exists(db_path) and csv_path and os.path.exists(csv_path):
+        print(f"Importing aircraft database from {csv_path}...")
+        try:
+            count = import_csv(csv_path, db_path)
+            print(f"Imported {count} aircraft into {db_path}")
+        except (OSError, ValueError, csv.Error) as e:
+            print(f"Aircraft database import failed: {e}")
+            return None
+
+    if not os.path.exists(db_path):
+        return None
+
+    try:
+        return AircraftDatabase(db_path, settings.cache_size)
+    except (OSError, ValueError) as e:
+        print(f"Aircraft database error: {e}")
+        return None
@@ -2,16 +2,14 @@ from typing import Tuple
 
 import serial
 import pynmea2
-import configparser
 
-config = configparser.ConfigParser()
-config.read('config.ini')
+from src.utils.settings import GpsSettings
 
 
-def get_gps_location() -> Tuple[float, float]:
-    if config.get('GPS', 'type') == "auto":
-        port = config.get('GPS', 'port')
-        baud = config.getint('GPS', 'baud')
+def get_gps_location(settings: GpsSettings) -> Tuple[float, float]:
+    if settings.type == "auto":
+        port = settings.port
+        baud = settings.baud
         try:
             with serial.Serial(port, baud, timeout=1) as ser:
                 print("Connected to GPS. Waiting for lock...")
@@ -32,6 +30,6 @@ def get_gps_location() -> Tuple[float, float]:
 
         except Exception as e:
             print(f"Serial Error: {e}")
-            return config.getfloat('GPS', 'lat'), config.getfloat('GPS', 'lon')
+            return settings.lat, settings.lon
 
-    return config.getfloat('GPS', 'lat'), config.getfloat('GPS', 'lon')
+    return settings.lat, settings.lon
@@ -0,0 +1,247 @@
+import configparser
+import types
+from dataclasses import dataclass, field, fields, replace
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+CONFIG_PATH = 'config.ini'
+
+
+def _list(sep: str | None = None):
+    """Tuple option, split on `sep` (whitespace by default)"""
+    return field(default=(), metadata={"sep": sep})
+
+
+@dataclass(frozen=True)
+class RadarSettings:
+    radius: float = 0.3  # Degrees from the origin to the edge of the scope
+    ring_count: int = 4
+
+    def validate(self):
+        _check(self.radius > 0, 'RADAR', 'radius', "must be positive")
+        _check(self.ring_count >= 0, 'RADAR', 'ring_count', "can't be negative")
+
+
+@dataclass(frozen=True)
+class GuiSettings:
+    fps: int = 120
+    font_size: int = 12
+    font: str = "Monospace"
+
+    def validate(self):
+        _check(0 < self.fps <= 1000, 'GUI', 'fps', "must be between 1 and 1000")
+        _check(self.font_size > 0, 'GUI', 'font_size', "must be positive")
+
+
+@dataclass(frozen=True)
+class SocketSettings:
+    host: str = "localhost"
+    port: int | None = None  # Default port of the format when unset
+    format: str = "sbs"
+    queue_size: int = 5000
+    emit_interval: float = 0.1
+
+    def validate(self):
+        _check(self.format in ("sbs", "beast"), 'SOCKET', 'format',
+               "must be sbs or beast")
+        _check(self.port is None or 0 < self.port < 65536, 'SOCKET', 'port',
+               "must be a TCP port")
+        _check(self.queue_size > 0, 'SOCKET', 'queue_size', "must be positive")
+        _check(self.emit_interval >= 0, 'SOCKET', 'emit_interval',
+               "can't be negative")
+
+
+@dataclass(frozen=True)
+class GpsSettings:
+    type: str = "auto"
+    port: str = "/dev/ttyACM0"
+    baud: int = 9600
+    lat: float = 0.0
+    lon: float = 0.0
+
+    def validate(self):
+        _check(-90 <= self.lat <= 90, 'GPS', 'lat', "must be a latitude")
+        _check(-180 <= self.lon <= 180, 'GPS', 'lon', "must be a longitude")
+
+
+@dataclass(frozen=True)
+class ConflictSettings:
+    enabled: bool = True
+    lateral_nm: float = 3.0
+    vertical_ft: float = 1000.0
+    lookahead: float = 60.0
+    max_closure_kt: float = 1000.0
+
+    def validate(self):
+        for name in ('lateral_nm', 'vertical_ft', 'lookahead', 'max_closure_kt'):
+            _check(getattr(self, name) > 0, 'CONFLICT', name, "must be positive")
+
+
+@dataclass(frozen=True)
+class AircraftDbSettings:
+    path: str = "data/aircraft.db"
+    csv: str = "data/aircraft.csv"
+    cache_size: int = 4096
+
+    def validate(self):
+        _check(self.cache_size >= 0, 'AIRCRAFT_DB', 'cache_size',
+               "can't be negative")
+
+
+@dataclass(frozen=True)
+class MapSettings:
+    files: tuple[str, ...] = _list(",")
+    filled: tuple[str, ...] = _list(",")
+    cache: str = "data/map_cache"
+
+    def validate(self):
+        pass
+
+
+@dataclass(frozen=True)
+class CoverageSettings:
+    path: str = "data/coverage.npz"
+    save_interval: float = 60.0
+    max_range: float = 300.0
+    sectors: int = 72
+    range_bins: int = 60
+
+    def validate(self):
+        for name in ('save_interval', 'max_range', 'sectors', 'range_bins'):
+            _check(getattr(self, name) > 0, 'COVERAGE', name, "must be positive")
+
+
+@dataclass(frozen=True)
+class StreamSettings:
+    enabled: bool = False
+    host: str = "0.0.0.0"
+    port: int = 8080
+    rate: float = 10.0
+
+    def validate(self):
+        _check(0 < self.port < 65536, 'STREAM', 'port', "must be a TCP port")
+        _check(self.rate > 0, 'STREAM', 'rate', "must be positive")
+
+
+@dataclass(frozen=True)
+class FilterSettings:
+    types: tuple[str, ...] = ("MSG,1", "MSG,2", "MSG,3", "MSG,4", "MSG,5",
+                              "MSG,6", "MSG,7", "MSG,8", "SEL", "ID", "STA")
+    watchlist: tuple[str, ...] = _list()
+    ignore: tuple[str, ...] = _list()
+
+    def validate(self):
+        pass
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Every section of config.ini, parsed and validated once"""
+    radar: RadarSettings = RadarSettings()
+    gui: GuiSettings = GuiSettings()
+    socket: SocketSettings = SocketSettings()
+    gps: GpsSettings = GpsSettings()
+    conflict: ConflictSettings = ConflictSettings()
+    aircraft_db: AircraftDbSettings = AircraftDbSettings()
+    map: MapSettings = MapSettings()
+    coverage: CoverageSettings = CoverageSettings()
+    stream: StreamSettings = StreamSettings()
+    filter: FilterSettings = FilterSettings()
+
+    def changed_sections(self, other: "Settings") -> set[str]:
+        return {f.name for f in fields(self)
+                if getattr(self, f.name) != getattr(other, f.name)}
+
+
+def _check(ok: bool, section: str, option: str, message: str):
+    if not ok:
+        raise ValueError(f"[{section}] {option} {message}")
+
+
+def _parse(parser: configparser.ConfigParser, section: str, cls):
+    """Build a section dataclass, keeping defaults for missing options"""
+    values = {}
+    if not parser.has_section(section):
+        return cls()
+
+    for f in fields(cls):
+        if not parser.has_option(section, f.name):
+            continue
+
+        raw = parser.get(section, f.name).strip()
+        try:
+            if f.type is bool:
+                values[f.name] = parser.getboolean(section, f.name)
+            elif f.type in (int, float):
+                values[f.name] = f.type(raw)
+            elif isinstance(f.type, types.UnionType):
+                # Optional numbers, empty means unset
+                values[f.name] = int(raw) if raw else None
+            elif f.type is str:
+                values[f.name] = raw.strip('"\'')
+            else:
+                sep = f.metadata.get("sep")
+                values[f.name] = tuple(v.strip() for v in raw.split(sep) if v.strip())
+        except ValueError:
+            raise ValueError(f"[{section}] {f.name} has invalid value {raw!r}")
+
+    return cls(**values)
+
+
+def load_settings(path: str = CONFIG_PATH) -> Settings:
+    """Read and validate config.ini
+
+    Raises:
+        ValueError: If an option can't be parsed or is out of range
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+
+    sections = {}
+    for f in fields(Settings):
+        section = _parse(parser, f.name.upper(), f.default.__class__)
+        section.validate()
+        sections[f.name] = section
+
+    return replace(Settings(), **sections)
+
+
+class SettingsWatcher(QObject):
+    """Reloads config.ini when it changes on disk.
+
+    Editors often replace the file rather than write it in place, so the
+    path is re-added after every change, and bursts of events are
+    debounced into one reload. Invalid edits are reported and ignored.
+    """
+    settings_changed = Signal(object)
+
+    def __init__(self, settings: Settings, path: str = CONFIG_PATH):
+        super().__init__()
+        self.settings = settings
+        self.path = path
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(200)
+        self._debounce.timeout.connect(self.reload)
+
+        self._watcher = QFileSystemWatcher([path], self)
+        self._watcher.fileChanged.connect(lambda _path: self._debounce.start())
+
+    def reload(self):
+        if self.path not in self._watcher.files():
+            self._watcher.addPath(self.path)
+
+        try:
+            settings = load_settings(self.path)
+        except ValueError as e:
+            print(f"Ignoring config.ini change: {e}")
+            return
+
+        changed = settings.changed_sections(self.settings)
+        if not changed:
+            return
+
+        print(f"Reloaded config.ini: {', '.join(sorted(changed))} changed")
+        self.settings = settings
+        self.settings_changed.emit(settings)
@@ -0,0 +1,285 @@
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import threading
+
+from src.utils.settings import StreamSettings
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# Column order of every aircraft row sent to clients
+FIELDS = ["callsign", "latitude", "longitude", "altitude", "groundSpeed",
+          "track", "verticalRate", "squawk", "onGround", "emergency"]
+
+
+def _row(plane) -> tuple:
+    return tuple(getattr(plane, name) for name in FIELDS)
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode()
+
+
+def _ws_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+    """Unmasked, unfragmented server-to-client WebSocket frame"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+class _Client:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.wake = asyncio.Event()
+        self.busy = False
+        # A delta shared with every up-to-date client, or the rows that
+        # changed while this client was still sending
+        self.frame: bytes | None = None
+        self.pending: dict[str, tuple | None] = {}
+
+    @property
+    def caught_up(self) -> bool:
+        return not self.busy and self.frame is None and not self.pending
+
+
+class StreamServer:
+    """Publishes the aircraft table to WebSocket clients as JSON deltas.
+
+    `publish` snapshots each plane into a row of plain values, so it is
+    connected directly to the worker thread's `planes_updated` and the
+    server never reads a `Plane` the worker is changing. An asyncio loop on
+    its own thread
+    diffs the latest table at a fixed rate, encodes one delta for every
+    client that is keeping up and merges it into a per-client backlog for
+    the rest, so a slow client receives the newest state rather than a
+    growing queue. `GET /aircraft.json` returns a full snapshot.
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 8080, rate: float = 10.0):
+        self.host = host
+        self.port = port
+        self.interval = 1.0 / rate
+
+        self._latest: dict[str, tuple] | None = None
+        self._published: dict[str, tuple] | None = None
+        self._rows: dict[str, tuple] = {}
+        self._seq = 0
+        self._clients: set[_Client] = set()
+        self._handlers: set[asyncio.Task] = set()
+
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopping: asyncio.Event | None = None
+
+    def publish(self, planes: dict) -> None:
+        self._latest = {hex_id: _row(p) for hex_id, p in planes.items()}
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._loop and self._stopping:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        except OSError as e:
+            print(f"Stream server error: {e}")
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        print(f"Streaming aircraft on ws://{self.host}:{self.port}/")
+        broadcaster = asyncio.create_task(self._broadcast())
+
+        async with server:
+            await self._stopping.wait()
+            broadcaster.cancel()
+            for client in list(self._clients):
+                client.writer.close()
+
+            # Closing the writers ends each handler's read loop; let them
+            # return rather than be cancelled by the loop teardown
+            if self._handlers:
+                await asyncio.wait(self._handlers, timeout=1.0)
+
+    def _snapshot(self) -> dict:
+        return {"type": "snapshot", "seq": self._seq,
+                "fields": FIELDS, "aircraft": self._rows}
+
+    async def _broadcast(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+
+            rows = self._latest
+            if rows is None or rows is self._published:
+                continue
+            self._published = rows
+
+            upsert = {h: r for h, r in rows.items() if self._rows.get(h) != r}
+            remove = [h for h in self._rows if h not in rows]
+            self._rows = rows
+            if not upsert and not remove:
+                continue
+
+            self._seq += 1
+            frame = None
+            for client in self._clients:
+                if client.caught_up:
+                    if frame is None:
+                        frame = _ws_frame(_encode({
+                            "type": "delta", "seq": self._seq,
+                            "upsert": upsert, "remove": remove}))
+                    client.frame = frame
+                else:
+                    client.pending.update(upsert)
+                    client.pending.update(dict.fromkeys(remove))
+                client.wake.set()
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            await self._route(reader, writer)
+        finally:
+            self._handlers.discard(task)
+
+    async def _route(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+
+        lines = request.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if len(parts) < 2 or parts[0] != "GET":
+            await self._respond(writer, "405 Method Not Allowed", b"")
+        elif headers.get("upgrade", "").lower() == "websocket":
+            await self._websocket(reader, writer, headers)
+        elif parts[1].split("?")[0] in ("/", "/aircraft.json"):
+            await self._respond(writer, "200 OK", _encode(self._snapshot()),
+                                "application/json")
+        else:
+            await self._respond(writer, "404 Not Found", b"")
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: str, body: bytes,
+                       content_type: str = "text/plain") -> None:
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Connection: close\r\n\r\n".encode() + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _websocket(self, reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter, headers: dict) -> None:
+        key = headers.get("sec-websocket-key")
+        if not key:
+            await self._respond(writer, "400 Bad Request", b"")
+            return
+
+        accept = base64.b64encode(
+            hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode())
+
+        client = _Client(writer)
+        client.frame = _ws_frame(_encode(self._snapshot()))
+        client.wake.set()
+        self._clients.add(client)
+
+        sender = asyncio.create_task(self._send(client))
+        try:
+            await self._receive(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._clients.discard(client)
+            sender.cancel()
+            writer.close()
+
+    async def _send(self, client: _Client) -> None:
+        try:
+            while True:
+                await client.wake.wait()
+                client.wake.clear()
+
+                if client.frame is not None:
+                    data, client.frame = client.frame, None
+                elif client.pending:
+                    pending, client.pending = client.pending, {}
+                    data = _ws_frame(_encode({
+                        "type": "delta", "seq": self._seq,
+                        "upsert": {h: r for h, r in pending.items() if r is not None},
+                        "remove": [h for h, r in pending.items() if r is None]}))
+                else:
+                    continue
+
+                client.busy = True
+                client.writer.write(data)
+                await client.writer.drain()
+                client.busy = False
+                if client.pending:
+                    client.wake.set()
+        except ConnectionError:
+            client.writer.close()
+
+    @staticmethod
+    async def _receive(reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter) -> None:
+        """Read client frames until close, answering pings"""
+        while True:
+            first, second = await reader.readexactly(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length, = struct.unpack("!H", await reader.readexactly(2))
+            elif length == 127:
+                length, = struct.unpack("!Q", await reader.readexactly(8))
+
+            mask = await reader.readexactly(4) if second & 0x80 else b"\0\0\0\0"
+            payload = bytes(b ^ mask[i % 4] for i, b in
+                            enumerate(await reader.readexactly(length)))
+
+            if opcode == 0x8:
+                writer.write(_ws_frame(payload[:2], opcode=0x8))
+                return
+            if opcode == 0x9:
+                writer.write(_ws_frame(payload, opcode=0xA))
+
+
+def create_stream_server(settings: StreamSettings) -> StreamServer | None:
+    """Server configured under [STREAM], or None when disabled"""
+    if not settings.enabled:
+        return None
+
+    return StreamServer(settings.host, settings.port, settings.rate)
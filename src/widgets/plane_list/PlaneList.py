@@ -15,6 +15,12 @@ class PlaneList(QScrollArea):
         self.setLayout(self._layout)
         self.setContentsMargins(0, 0, 0, 0)
 
+        self.planes = {}
+        self.conflict_ids: set[str] = set()
+        self.ingest_text = ""
+        self._last_stats: dict | None = None
+        self._shedding = False
+
     def clear(self):
         while self._layout and self._layout.count():
             item = self._layout.takeAt(0)
@@ -22,6 +28,37 @@ class PlaneList(QScrollArea):
             if widget:
                 widget.deleteLater()
 
+    @Slot(list)
+    def handle_conflict_update(self, conflicts):
+        self.conflict_ids = {h for c in conflicts for h in (c.hex_a, c.hex_b)}
+        self.handle_socket_update(self.planes)
+
+    @Slot(dict)
+    def handle_ingest_stats(self, stats):
+        """Summarise the worker's ingest queue counters, sent every second"""
+        last = self._last_stats or stats
+        rate = stats["received"] - last["received"]
+        shed = sum(stats["shed"].values()) - sum(last["shed"].values())
+        self._last_stats = stats
+
+        self.ingest_text = f"{rate} msg/s"
+        if stats["filter"]["seen"]:
+            self.ingest_text += f", {stats['filter']['hit_rate']:.0%} filtered"
+        if shed:
+            self.ingest_text += f", {shed} shed"
+        if stats.get("types"):
+            busiest = sorted(stats["types"].items(), key=lambda kv: -kv[1])[:4]
+            self.ingest_text += "\n" + ", ".join(f"{name}: {n}" for name, n in busiest)
+
+        # Logged once per overload rather than every second of it
+        if bool(shed) != self._shedding:
+            self._shedding = bool(shed)
+            if shed:
+                print(f"Ingest overloaded, shedding messages "
+                      f"(max depth {stats['max_depth']})")
+            else:
+                print(f"Ingest recovered, shed {stats['shed']} since start")
+
     @Slot(dict)
     def handle_socket_update(self, updated_planes):
         self.clear()
@@ -30,7 +67,8 @@ class PlaneList(QScrollArea):
         count = 0
         for p in self.planes.values():
             if p.callsign and p.longitude and p.latitude:
-                self._layout.addWidget(p.generate_widget())
+                self._layout.addWidget(p.generate_widget(
+                    alert=p.hexIdent in self.conflict_ids))
             else:
                 count += 1
 
@@ -38,3 +76,5 @@ class PlaneList(QScrollArea):
 
         unaccounted_label = QLabel(f"{count} detected with no position")
         self._layout.addWidget(unaccounted_label)
+        if self.ingest_text:
+            self._layout.addWidget(QLabel(self.ingest_text))
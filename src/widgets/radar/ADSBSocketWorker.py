@@ -1,75 +1,298 @@
 from datetime import datetime
 import socket
+import threading
+import time
 from PySide6.QtCore import QObject, Signal, Slot, QTimer, QCoreApplication
 
 from src.widgets.radar.Plane import Plane
+from src.widgets.radar.ConflictDetector import ConflictDetector
+from src.widgets.radar.CoverageStats import CoverageStats
+from src.widgets.radar.BeastDecoder import BeastDecoder
+from src.widgets.radar.IngestQueue import IngestQueue
+from src.widgets.radar.PreFilter import SBSPreFilter
+from src.utils.aircraft_db import load_aircraft_database
+from src.utils.settings import Settings
+
+DEFAULT_PORTS = {"sbs": 30003, "beast": 30005}
+
+# Seconds between attempts to reach the receiver, doubling up to the max
+RETRY_MIN = 1.0
+RETRY_MAX = 30.0
 
 
 class ADSBSocketWorker(QObject):
     planes_updated = Signal(dict)
+    conflicts_updated = Signal(list)
+    ingest_stats = Signal(dict)
+    coverage_updated = Signal(list)
 
-    def __init__(self, host="localhost", port=30003):
+    def __init__(self, settings: Settings = Settings(),
+                 conflicts: ConflictDetector | None = None,
+                 origin: tuple[float, float] | None = None,
+                 wait_for_ack: bool = False,
+                 coverage: CoverageStats | None = None):
         super().__init__()
-        self.host = host
-        self.port = port
+        self.settings = settings
+        self.origin = origin
         self._running = True
+        self._reconnect = False
         self.planes = {}
 
+        # Beast frames are decoded in-process, SBS lines are parsed by Plane
+        self.beast = self.create_decoder()
+        self.conflicts = conflicts
+        self.coverage = coverage
+        self.aircraft_db = None
+
+        # SBS lines are filtered by prefix, then decoupled from parsing by a
+        # bounded queue, and consumers get at most one pending planes_updated
+        self.prefilter = SBSPreFilter.from_settings(settings.filter)
+        self.queue = IngestQueue(settings.socket.queue_size)
+        self.emit_interval = settings.socket.emit_interval
+        self.wait_for_ack = wait_for_ack
+        self._dirty = False
+        self._in_flight = False
+        self._last_emit = 0.0
+
+    def create_decoder(self) -> BeastDecoder | None:
+        if self.settings.socket.format == "beast":
+            return BeastDecoder(self.origin)
+        return None
+
+    @Slot(object)
+    def apply_settings(self, settings: Settings):
+        """Apply a reloaded config between batches of the read loop"""
+        old, new = self.settings.socket, settings.socket
+        self.settings = settings
+
+        if (new.host, new.port, new.format) != (old.host, old.port, old.format):
+            self._reconnect = True
+        self.queue.resize(new.queue_size)
+        self.emit_interval = new.emit_interval
+
+        # The reader thread picks up the new filter on its next chunk
+        self.prefilter = SBSPreFilter.from_settings(settings.filter)
+        if self.conflicts and settings.conflict != self.conflicts.settings:
+            self.conflicts.configure(settings.conflict)
+            # Clears any highlighted pairs if detection was switched off
+            self.conflicts_updated.emit(self.conflicts.conflicts)
+
+    def reading(self) -> bool:
+        return self._running and not self._reconnect
+
     @Slot()
     def run(self):
+        # Opened here so a first-time CSV import stays off the GUI thread
+        self.aircraft_db = load_aircraft_database(self.settings.aircraft_db)
+
         self.cleanup_timer = QTimer()
         self.cleanup_timer.timeout.connect(self.purge_stale_planes)
         self.cleanup_timer.start(1000)
 
+        delay = RETRY_MIN
+        try:
+            while self._running:
+                self._reconnect = False
+                if self.connect_and_read():
+                    delay = RETRY_MIN
+
+                # Retry the same target after a backoff, or straight away
+                # once the config points somewhere else
+                retry_at = time.monotonic() + delay
+                while (self._running and not self._reconnect
+                       and time.monotonic() < retry_at):
+                    QCoreApplication.processEvents()
+                    time.sleep(0.1)
+
+                if self._reconnect:
+                    self.beast = self.create_decoder()
+                    delay = RETRY_MIN
+                else:
+                    delay = min(delay * 2, RETRY_MAX)
+        finally:
+            if self.coverage:
+                self.coverage.save()
+
+    def connect_and_read(self) -> bool:
+        """Read from the configured receiver until it goes away
+
+        Returns:
+            bool: True if a connection was made
+        """
+        target = self.settings.socket
+        port = target.port or DEFAULT_PORTS[target.format]
+
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.settimeout(0.2)
 
+        connected = False
         try:
-            sock.connect((self.host, self.port))
-            buffer = ""
+            print(f"Connecting to {target.host}:{port} ({target.format})")
+            sock.connect((target.host, port))
+            connected = True
+            if self.beast:
+                self.run_beast(sock)
+            else:
+                self.run_sbs(sock)
+        except Exception as e:
+            print(f"Socket Error: {e}")
+        finally:
+            sock.close()
+        return connected
 
-            while self._running:
-                QCoreApplication.processEvents()
+    def run_beast(self, sock: socket.socket):
+        # The decoder outpaces any receiver, so frames are decoded inline
+        while self.reading():
+            QCoreApplication.processEvents()
+            try:
+                data = sock.recv(16384)
+                if not data:
+                    break
+
+            except socket.timeout:
+                # Send anything held back by the rate limit or an ack
+                self.publish()
+                continue
+
+            self.handle_frames(data)
+            self.finish_batch()
+
+    def run_sbs(self, sock: socket.socket):
+        reader = threading.Thread(target=self.read_lines, args=(sock,),
+                                  daemon=True)
+        reader.start()
+
+        while self.reading() and (reader.is_alive() or len(self.queue)):
+            QCoreApplication.processEvents()
+            for line in self.queue.get_batch():
+                self.handle_line(line)
+            self.finish_batch()
+
+        reader.join()
+
+    def read_lines(self, sock: socket.socket):
+        """Socket reader thread, feeding the ingest queue"""
+        buffer = b""
+        try:
+            while self.reading():
                 try:
-                    data = sock.recv(1024).decode('utf-8')
+                    data = sock.recv(4096)
                     if not data:
                         break
 
-                    buffer += data
-
                 except socket.timeout:
                     continue
 
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    message = line.split(',')
-                    if len(message) < 5:
-                        continue
-
-                    hex_id = message[4]
-                    if hex_id not in self.planes:
-                        self.planes[hex_id] = Plane(hexIdent=hex_id)
-
-                    try:
-                        self.planes[hex_id].update(message)
-                        now = datetime.now()
-                        stale_ids = [
-                            hid for hid, p in self.planes.items()
-                            if (now - p.lastLogUpdate)
-                        ]
-                        self.planes_updated.emit(self.planes.copy())
-                    except Exception as e:
-                        print("Failed to update: ", line, {e},  "END")
-        except Exception as e:
+                buffer += data
+                *lines, buffer = buffer.split(b'\n')
+                accept = self.prefilter.accept
+                for line in lines:
+                    # Only lines we want are decoded at all
+                    if accept(line):
+                        self.queue.put(line.decode('utf-8'))
+        except OSError as e:
             print(f"Socket Error: {e}")
-        finally:
-            sock.close()
+
+    def finish_batch(self):
+        # One conflict pass per batch rather than per message
+        if self.conflicts and self.conflicts.evaluate():
+            self.conflicts_updated.emit(self.conflicts.conflicts)
+        self.publish()
+
+    def publish(self):
+        now = time.monotonic()
+        if (not self._dirty or now - self._last_emit < self.emit_interval
+                or (self.wait_for_ack and self._in_flight)):
+            return
+
+        self._dirty = False
+        self._in_flight = True
+        self._last_emit = now
+        self.planes_updated.emit(self.planes.copy())
+
+    def acknowledge(self):
+        """Called by the consumer once it has handled planes_updated"""
+        self._in_flight = False
+
+    def get_plane(self, hex_id: str) -> Plane:
+        plane = self.planes.get(hex_id)
+        if plane is None:
+            plane = self.planes[hex_id] = Plane(hexIdent=hex_id)
+            self.attach_aircraft_info(plane)
+        return plane
+
+    def handle_line(self, line: str):
+        message = line.split(',')
+        if len(message) < 5:
+            return
+
+        plane = self.get_plane(message[4])
+        try:
+            plane.update(message)
+            if self.coverage:
+                self.record_coverage(message, plane)
+            if self.conflicts:
+                self.conflicts.update(plane)
+            self._dirty = True
+        except Exception as e:
+            print("Failed to update: ", line, {e},  "END")
+
+    def handle_frames(self, data: bytes):
+        updates = self.beast.feed(data)
+        # Beast bypasses the queue, but the rate shown in the list comes from
+        # its counters; only the reader thread touches them in SBS mode
+        self.queue.stats.received += len(updates)
+        for hex_id, kind, fields in updates:
+            plane = self.get_plane(hex_id)
+            plane.apply(fields)
+            if self.coverage:
+                self.coverage.record_message(kind, hex_id)
+                if "latitude" in fields:
+                    self.coverage.record_position(
+                        fields["latitude"], fields["longitude"])
+            if self.conflicts:
+                self.conflicts.update(plane)
+
+        if updates:
+            self._dirty = True
+
+    def record_coverage(self, message: list[str], plane: Plane):
+        transmission_type = message[0]
+        if transmission_type == "MSG" and len(message) > 1:
+            transmission_type = f"MSG,{message[1]}"
+        self.coverage.record_message(transmission_type, plane.hexIdent)
+
+        # Only messages that actually carried a position, not ones where
+        # the plane kept its previous one
+        if (transmission_type in ("MSG,2", "MSG,3") and len(message) > 15
+                and message[14] and message[15]
+                and plane.latitude is not None and plane.longitude is not None):
+            self.coverage.record_position(plane.latitude, plane.longitude)
+
+    def attach_aircraft_info(self, plane: Plane):
+        info = self.aircraft_db.lookup(plane.hexIdent) if self.aircraft_db else None
+        if info:
+            plane.registration = info.registration
+            plane.aircraftType = info.aircraftType
+            plane.operator = info.operator
 
     def stop(self):
         self._running = False
 
     @Slot()
     def purge_stale_planes(self):
+        stats = self.queue.stats.snapshot()
+        stats["filter"] = self.prefilter.snapshot()
+        if self.coverage:
+            # Emitted once a second, so these are messages per second
+            stats["types"] = self.coverage.take_rates()
+        self.ingest_stats.emit(stats)
+
+        if self.coverage:
+            self.coverage.maybe_save()
+            if self.coverage.take_changed():
+                self.coverage_updated.emit(self.coverage.coverage_polygon())
+
         now = datetime.now()
         to_remove = [hid for hid, p in self.planes.items()
                      if (now - p.lastLogUpdate).total_seconds() > 60]
@@ -77,4 +300,14 @@ class ADSBSocketWorker(QObject):
         if to_remove:
             for hid in to_remove:
                 del self.planes[hid]
-            self.planes_updated.emit(self.planes)
+                if self.conflicts:
+                    self.conflicts.remove(hid)
+                if self.beast:
+                    self.beast.forget(hid)
+            if self.conflicts:
+                self.conflicts_updated.emit(self.conflicts.conflicts)
+            self._dirty = True
+
+        # Also retries an update held back while the last one was in flight,
+        # which matters when no data is arriving to trigger it
+        self.publish()
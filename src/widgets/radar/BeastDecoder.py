@@ -0,0 +1,469 @@
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+# Beast frame types and their Mode-S/AC payload lengths in bytes. Each
+# frame is 0x1a, type, 6 byte MLAT timestamp, 1 byte signal level, payload,
+# with any 0x1a inside the frame doubled.
+ESCAPE = 0x1a
+FRAME_LENGTHS = {0x31: 2, 0x32: 7, 0x33: 14}
+HEADER_LENGTH = 7
+
+CALLSIGN_CHARS = "#ABCDEFGHIJKLMNOPQRSTUVWXYZ##### ###############0123456789######"
+
+CPR_MAX = float(1 << 17)
+NZ = 15
+POSITION_PAIR_TIMEOUT = 10.0  # Seconds between an even/odd pair
+LOCAL_DECODE_TIMEOUT = 60.0  # Seconds a fix stays usable as a reference
+RSSI_FLOOR = -50.0  # dBFS reported for a zero signal byte
+
+
+def _crc_table() -> np.ndarray:
+    table = np.zeros(256, dtype=np.uint32)
+    for i in range(256):
+        c = i << 16
+        for _ in range(8):
+            c = ((c << 1) ^ 0xFFF409) if c & 0x800000 else c << 1
+        table[i] = c & 0xFFFFFF
+    return table
+
+
+CRC_TABLE = _crc_table()
+
+
+def mode_s_crc(frames: np.ndarray) -> np.ndarray:
+    """Mode-S CRC of every row, excluding the trailing 3 parity bytes
+
+    Args:
+        frames (np.ndarray): uint8 array of shape (N, 7) or (N, 14)
+
+    Returns:
+        np.ndarray: uint32 array of N 24-bit remainders
+    """
+    crc = np.zeros(len(frames), dtype=np.uint32)
+    for i in range(frames.shape[1] - 3):
+        crc = ((crc << 8) & 0xFFFFFF) ^ CRC_TABLE[((crc >> 16) ^ frames[:, i]) & 0xFF]
+    return crc
+
+
+def _be_int(frames: np.ndarray, start: int, length: int) -> np.ndarray:
+    """Big-endian unsigned integer from `length` bytes of every row"""
+    value = np.zeros(len(frames), dtype=np.uint64)
+    for i in range(start, start + length):
+        value = (value << np.uint64(8)) | frames[:, i].astype(np.uint64)
+    return value
+
+
+def _bits(value: np.ndarray, start: int, length: int, width: int = 56) -> np.ndarray:
+    """Bits `start`..`start + length - 1` (1-indexed, MSB first) of a field"""
+    shift = np.uint64(width - start - length + 1)
+    return ((value >> shift) & np.uint64((1 << length) - 1)).astype(np.int64)
+
+
+def cpr_nl(lat: float) -> int:
+    """Number of longitude zones at a latitude"""
+    if lat == 0:
+        return 59
+    if abs(lat) == 87:
+        return 2
+    if abs(lat) > 87:
+        return 1
+
+    a = 1 - math.cos(math.pi / (2 * NZ))
+    b = math.cos(math.pi / 180 * abs(lat)) ** 2
+    return int(math.floor(2 * math.pi / math.acos(1 - a / b)))
+
+
+def cpr_global(even: tuple[float, float], odd: tuple[float, float],
+               latest_odd: bool) -> tuple[float, float] | None:
+    """Airborne position from an even/odd pair of normalised CPR coordinates"""
+    lat0, lon0 = even
+    lat1, lon1 = odd
+    dlat0, dlat1 = 360.0 / 60, 360.0 / 59
+
+    j = math.floor(59 * lat0 - 60 * lat1 + 0.5)
+    rlat0 = dlat0 * (j % 60 + lat0)
+    rlat1 = dlat1 * (j % 59 + lat1)
+    if rlat0 >= 270:
+        rlat0 -= 360
+    if rlat1 >= 270:
+        rlat1 -= 360
+
+    # Both frames must come from the same longitude zone band
+    if cpr_nl(rlat0) != cpr_nl(rlat1):
+        return None
+
+    lat = rlat1 if latest_odd else rlat0
+    nl = cpr_nl(lat)
+    ni = max(nl - 1 if latest_odd else nl, 1)
+    m = math.floor(lon0 * (nl - 1) - lon1 * nl + 0.5)
+    lon = 360.0 / ni * (m % ni + (lon1 if latest_odd else lon0))
+    if lon >= 180:
+        lon -= 360
+
+    return lat, lon
+
+
+def cpr_local(ref: tuple[float, float], cpr: tuple[float, float], odd: bool,
+              surface: bool = False) -> tuple[float, float]:
+    """Position from a single CPR frame near a known reference position"""
+    ref_lat, ref_lon = ref
+    lat_cpr, lon_cpr = cpr
+    span = 90.0 if surface else 360.0
+
+    dlat = span / (60 - odd)
+    j = math.floor(ref_lat / dlat) + math.floor(
+        0.5 + (ref_lat % dlat) / dlat - lat_cpr)
+    lat = dlat * (j + lat_cpr)
+
+    dlon = span / max(cpr_nl(lat) - odd, 1)
+    m = math.floor(ref_lon / dlon) + math.floor(
+        0.5 + (ref_lon % dlon) / dlon - lon_cpr)
+    lon = dlon * (m + lon_cpr)
+
+    return lat, lon
+
+
+def surface_speed(movement: int) -> int | None:
+    if movement == 0:
+        return None
+    if movement > 123:
+        return 199
+    if movement > 108:
+        return (movement - 108) * 5 + 100
+    if movement > 93:
+        return (movement - 93) * 2 + 70
+    if movement > 38:
+        return movement - 38 + 15
+    if movement > 12:
+        return ((movement - 11) >> 1) + 2
+    if movement > 8:
+        return ((movement - 6) >> 2) + 1
+    return 0
+
+
+def decode_ac13(ac13: int) -> int | None:
+    """Altitude in feet from a 13-bit AC field (25 ft increments only)"""
+    m_bit, q_bit = ac13 & 0x0040, ac13 & 0x0010
+    if ac13 == 0 or m_bit or not q_bit:
+        return None
+
+    n = ((ac13 & 0x1F80) >> 2) | ((ac13 & 0x0020) >> 1) | (ac13 & 0x000F)
+    return n * 25 - 1000
+
+
+def decode_ac12(ac12: int) -> int | None:
+    """Altitude in feet from the 12-bit ES airborne position field"""
+    if ac12 == 0 or not ac12 & 0x010:
+        return None
+
+    n = ((ac12 & 0xFE0) >> 1) | (ac12 & 0x00F)
+    return n * 25 - 1000
+
+
+def decode_id13(id13: int) -> str:
+    """Squawk from a 13-bit Gillham-ordered identity field"""
+    bits = [(0x1000, 0x0010), (0x0800, 0x1000), (0x0400, 0x0020),
+            (0x0200, 0x2000), (0x0100, 0x0040), (0x0080, 0x4000),
+            (0x0020, 0x0100), (0x0010, 0x0001), (0x0008, 0x0200),
+            (0x0004, 0x0002), (0x0002, 0x0400), (0x0001, 0x0004)]
+    squawk = 0
+    for src, dst in bits:
+        if id13 & src:
+            squawk |= dst
+    return f"{squawk:04x}"
+
+
+@dataclass
+class _Track:
+    """Per-aircraft CPR state"""
+    even: tuple[float, float, float] | None = None  # lat, lon, time
+    odd: tuple[float, float, float] | None = None
+    position: tuple[float, float, float] | None = None
+
+
+class BeastDecoder:
+    """Decodes a Beast binary stream into `Plane` attribute updates.
+
+    Complete frames in each chunk are stacked into NumPy arrays so CRC
+    checks and field extraction run once per chunk; only CPR pairing, which
+    depends on per-aircraft state, is done frame by frame.
+    """
+
+    def __init__(self, receiver: tuple[float, float] | None = None):
+        self.receiver = receiver
+        self._buffer = b""
+        self._tracks: dict[int, _Track] = {}
+
+    def feed(self, data: bytes) -> list[tuple[str, str, dict]]:
+        """Decode everything complete in `data` plus any buffered remainder.
+
+        Returns:
+            list[tuple[str, str, dict]]: (hex ident, message type,
+                {Plane attribute: value}); types are named as in
+                `CoverageStats.MESSAGE_TYPES`
+        """
+        short, long = self._split_frames(self._buffer + data)
+        now = time.monotonic()
+
+        updates = []
+        if long:
+            updates += self._decode_long(np.frombuffer(
+                b"".join(long), dtype=np.uint8).reshape(-1, HEADER_LENGTH + 14), now)
+        if short:
+            updates += self._decode_short(np.frombuffer(
+                b"".join(short), dtype=np.uint8).reshape(-1, HEADER_LENGTH + 7), now)
+        return updates
+
+    def forget(self, hex_id: str) -> None:
+        self._tracks.pop(int(hex_id, 16), None)
+
+    def _split_frames(self, buf: bytes) -> tuple[list[bytes], list[bytes]]:
+        """Unescape complete Mode-S frames, keeping any partial frame"""
+        short, long = [], []
+        pos, end = 0, len(buf)
+
+        while True:
+            start = buf.find(b"\x1a", pos)
+            if start < 0 or start + 1 >= end:
+                self._buffer = buf[start:] if start >= 0 else b""
+                break
+
+            length = FRAME_LENGTHS.get(buf[start + 1])
+            if length is None:
+                pos = start + 1
+                continue
+
+            size = HEADER_LENGTH + length
+            body = buf[start + 2:start + 2 + size]
+            stop = start + 2 + size
+
+            if ESCAPE in body:
+                body, stop = self._unescape(buf, start + 2, size)
+                if body is None:
+                    # Either incomplete or a lone 0x1a starting the next frame
+                    if stop >= end:
+                        self._buffer = buf[start:]
+                        break
+                    pos = stop
+                    continue
+            elif len(body) < size:
+                self._buffer = buf[start:]
+                break
+
+            if length == 14:
+                long.append(body)
+            elif length == 7:
+                short.append(body)
+            pos = stop
+
+        return short, long
+
+    @staticmethod
+    def _unescape(buf: bytes, pos: int, size: int) -> tuple[bytes | None, int]:
+        out = bytearray()
+        end = len(buf)
+        while len(out) < size:
+            if pos >= end:
+                return None, end
+            byte = buf[pos]
+            if byte == ESCAPE:
+                if pos + 1 >= end:
+                    return None, end
+                if buf[pos + 1] != ESCAPE:
+                    return None, pos
+                pos += 1
+            out.append(byte)
+            pos += 1
+        return bytes(out), pos
+
+    @staticmethod
+    def _rssi(signal: np.ndarray) -> np.ndarray:
+        level = signal.astype(np.float64) / 255.0
+        with np.errstate(divide="ignore"):
+            return np.maximum(20 * np.log10(level), RSSI_FLOOR)
+
+    def _decode_long(self, raw: np.ndarray, now: float) -> list[tuple[str, str, dict]]:
+        rssi = self._rssi(raw[:, 6])
+        frames = raw[:, HEADER_LENGTH:]
+
+        df = frames[:, 0] >> 3
+        crc = mode_s_crc(frames)
+        parity = _be_int(frames, 11, 3).astype(np.uint32)
+
+        # Extended squitter carries the address in clear and zero CRC remainder
+        es = ((df == 17) | (df == 18)) & (crc == parity)
+        # Comm-B replies overlay the address onto the parity
+        comm_b = (df == 20) | (df == 21)
+
+        updates = []
+        if es.any():
+            updates += self._decode_es(frames[es], rssi[es], now)
+        if comm_b.any():
+            updates += self._decode_surveillance(
+                frames[comm_b], crc[comm_b] ^ parity[comm_b], rssi[comm_b], now)
+        return updates
+
+    def _decode_short(self, raw: np.ndarray, now: float) -> list[tuple[str, str, dict]]:
+        rssi = self._rssi(raw[:, 6])
+        frames = raw[:, HEADER_LENGTH:]
+
+        df = frames[:, 0] >> 3
+        keep = (df == 4) | (df == 5)
+        if not keep.any():
+            return []
+
+        frames, rssi = frames[keep], rssi[keep]
+        address = mode_s_crc(frames) ^ _be_int(frames, 4, 3).astype(np.uint32)
+        return self._decode_surveillance(frames, address, rssi, now)
+
+    def _decode_surveillance(self, frames: np.ndarray, address: np.ndarray,
+                             rssi: np.ndarray, now: float) -> list[tuple[str, str, dict]]:
+        """DF4/5/20/21, trusted only for addresses already seen in a squitter"""
+        df = frames[:, 0] >> 3
+        fs = frames[:, 0] & 0x7
+        code13 = _bits(_be_int(frames, 2, 2), 4, 13, width=16)
+
+        updates = []
+        for i in range(len(frames)):
+            track = self._tracks.get(int(address[i]))
+            if track is None:
+                continue
+
+            status = int(fs[i])
+            fields = {
+                "rssi": float(rssi[i]),
+                "alert": status in (2, 3, 4),
+                "spi": status in (4, 5),
+            }
+            # FS 4/5 leave it open whether the aircraft is airborne
+            if status <= 3:
+                fields["onGround"] = status in (1, 3)
+            if df[i] in (4, 20):
+                altitude = decode_ac13(int(code13[i]))
+                if altitude is not None:
+                    fields["altitude"] = altitude
+            else:
+                fields["squawk"] = decode_id13(int(code13[i]))
+
+            updates.append((f"{int(address[i]):06X}", f"DF{int(df[i])}", fields))
+        return updates
+
+    def _decode_es(self, frames: np.ndarray, rssi: np.ndarray,
+                   now: float) -> list[tuple[str, str, dict]]:
+        icao = _be_int(frames, 1, 3)
+        me = _be_int(frames, 4, 7)
+        tc = _bits(me, 1, 5)
+
+        # Fields shared by position messages
+        odd = _bits(me, 22, 1)
+        lat_cpr = _bits(me, 23, 17) / CPR_MAX
+        lon_cpr = _bits(me, 40, 17) / CPR_MAX
+
+        updates = []
+        for i in range(len(frames)):
+            t = int(tc[i])
+            value = int(me[i])
+
+            # Only types that produce an update get a track, since tracks
+            # are only forgotten along with their plane
+            if not (1 <= t <= 22 or (t == 28 and (value >> 48) & 0x7 == 1)):
+                continue
+
+            address = int(icao[i])
+            track = self._tracks.get(address)
+            if track is None:
+                track = self._tracks[address] = _Track()
+
+            fields = {"rssi": float(rssi[i])}
+
+            if 1 <= t <= 4:
+                kind = "ES ident"
+                fields["callsign"] = "".join(
+                    CALLSIGN_CHARS[(value >> shift) & 0x3F]
+                    for shift in range(42, -1, -6)).replace("#", "").strip()
+
+            elif 5 <= t <= 8:
+                kind = "ES surface"
+                fields["onGround"] = True
+                fields["groundSpeed"] = surface_speed((value >> 44) & 0x7F)
+                if (value >> 43) & 0x1:
+                    fields["track"] = round(((value >> 36) & 0x7F) * 360 / 128)
+                self._position(track, fields, bool(odd[i]),
+                               (lat_cpr[i], lon_cpr[i]), now, surface=True)
+
+            elif 9 <= t <= 18 or 20 <= t <= 22:
+                kind = "ES airborne"
+                fields["onGround"] = False
+                ac12 = (value >> 36) & 0xFFF
+                if t <= 18:
+                    altitude = decode_ac12(ac12)
+                else:
+                    # GNSS height is plain metres
+                    altitude = round(ac12 * 3.28084) if ac12 else None
+                if altitude is not None:
+                    fields["altitude"] = altitude
+                self._position(track, fields, bool(odd[i]),
+                               (lat_cpr[i], lon_cpr[i]), now)
+
+            elif t == 19:
+                kind = "ES velocity"
+                self._velocity(value, fields)
+
+            else:
+                kind = "ES emergency"
+                fields["emergency"] = (value >> 45) & 0x7 != 0
+                fields["squawk"] = decode_id13((value >> 32) & 0x1FFF)
+
+            updates.append((f"{address:06X}", kind, fields))
+        return updates
+
+    def _position(self, track: _Track, fields: dict, odd: bool,
+                  cpr: tuple[float, float], now: float, surface=False) -> None:
+        lat_cpr, lon_cpr = float(cpr[0]), float(cpr[1])
+        if odd:
+            track.odd = lat_cpr, lon_cpr, now
+        else:
+            track.even = lat_cpr, lon_cpr, now
+
+        position = None
+        if track.position and now - track.position[2] < LOCAL_DECODE_TIMEOUT:
+            position = cpr_local(track.position[:2], (lat_cpr, lon_cpr),
+                                 odd, surface)
+        elif surface:
+            # Surface zones are a quarter size, so only a nearby reference works
+            if self.receiver:
+                position = cpr_local(self.receiver, (lat_cpr, lon_cpr),
+                                     odd, surface=True)
+        elif (track.even and track.odd
+              and abs(track.even[2] - track.odd[2]) < POSITION_PAIR_TIMEOUT):
+            position = cpr_global(track.even[:2], track.odd[:2], odd)
+
+        if position is None:
+            return
+
+        track.position = position[0], position[1], now
+        fields["latitude"], fields["longitude"] = position
+
+    @staticmethod
+    def _velocity(value: int, fields: dict) -> None:
+        subtype = (value >> 48) & 0x7
+
+        if subtype in (1, 2):
+            v_ew = ((value >> 32) & 0x3FF) - 1
+            v_ns = ((value >> 21) & 0x3FF) - 1
+            if v_ew >= 0 and v_ns >= 0:
+                scale = 4 if subtype == 2 else 1
+                vx = -v_ew * scale if (value >> 42) & 0x1 else v_ew * scale
+                vy = -v_ns * scale if (value >> 31) & 0x1 else v_ns * scale
+                fields["groundSpeed"] = round(math.hypot(vx, vy))
+                fields["track"] = round(math.degrees(math.atan2(vx, vy)) % 360)
+
+        elif subtype in (3, 4) and (value >> 42) & 0x1:
+            fields["heading"] = ((value >> 32) & 0x3FF) * 360 / 1024
+
+        vr = ((value >> 10) & 0x1FF) - 1
+        if vr >= 0:
+            fields["verticalRate"] = -vr * 64 if (value >> 19) & 0x1 else vr * 64
@@ -0,0 +1,259 @@
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.utils.settings import ConflictSettings
+from src.widgets.radar.Plane import Plane
+
+NM_PER_DEG = 60.0
+
+# Rows without a new position for this long are left out of the search
+MAX_FIX_AGE = 10.0
+
+# Cell keys pack two signed grid coordinates into a single int64
+_CELL_OFFSET = 1 << 20
+_CELL_SHIFT = 1 << 21
+_NEIGHBOURS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+@dataclass(frozen=True)
+class Conflict:
+    hex_a: str
+    hex_b: str
+    time: float  # Seconds until closest point of approach
+    distance: float  # Lateral separation at CPA (nm)
+    vertical: float  # Vertical separation at CPA (ft)
+
+
+class ConflictDetector:
+    """Closest point of approach detection over every tracked aircraft.
+
+    State is kept in flat NumPy arrays indexed by a row per hex ident. Each
+    update only marks its row dirty; `evaluate` then tests the dirty rows
+    against the aircraft in neighbouring grid cells, so a burst of messages
+    costs one vectorised pass rather than one per pair.
+    """
+
+    def __init__(self, lat: float, lon: float,
+                 settings: ConflictSettings = ConflictSettings(),
+                 capacity: int = 256):
+        self.lat = lat
+        self.lon = lon
+        self._lon_scale = NM_PER_DEG * math.cos(math.radians(lat))
+
+        self._rows: dict[str, int] = {}
+        self._hexes: list[str | None] = []
+        self._free: list[int] = []
+        self._dirty: set[int] = set()
+        self._conflicts: dict[tuple[str, str], Conflict] = {}
+
+        self._pos = np.zeros((capacity, 2), dtype=np.float64)  # nm
+        self._vel = np.zeros((capacity, 2), dtype=np.float64)  # nm/s
+        self._alt = np.zeros(capacity, dtype=np.float64)  # ft
+        self._vrate = np.zeros(capacity, dtype=np.float64)  # ft/s
+        self._fix = np.zeros((capacity, 2), dtype=np.float64)  # Raw lat/lon
+        self._time = np.zeros(capacity, dtype=np.float64)  # Of the position
+        self._alt_time = np.zeros(capacity, dtype=np.float64)
+        self._valid = np.zeros(capacity, dtype=bool)
+
+        self.configure(settings)
+
+    def configure(self, settings: ConflictSettings) -> None:
+        """Apply thresholds; every tracked aircraft is re-tested next pass"""
+        self.settings = settings
+        self.enabled = settings.enabled
+        self.lateral = settings.lateral_nm
+        self.vertical = settings.vertical_ft
+        self.lookahead = settings.lookahead
+
+        # Any pair that can get within `lateral` inside the lookahead window
+        # starts at most one cell apart
+        self.cell_size = self.lateral + self.lookahead * settings.max_closure_kt / 3600.0
+
+        if self.enabled:
+            self._dirty.update(self._rows.values())
+        else:
+            # Nothing is tracked while disabled; rows refill on re-enable
+            self._conflicts.clear()
+            self._dirty.clear()
+            self._valid[:] = False
+
+    @property
+    def conflicts(self) -> list[Conflict]:
+        return list(self._conflicts.values())
+
+    def update(self, plane: Plane, now: float | None = None) -> None:
+        """Copy the kinematic state of `plane` into its row"""
+        if not self.enabled:
+            return
+
+        row = self._row_for(plane.hexIdent)
+        self._dirty.add(row)
+
+        if (plane.latitude is None or plane.longitude is None
+                or plane.altitude is None or plane.onGround):
+            self._valid[row] = False
+            return
+
+        now = time.monotonic() if now is None else now
+        speed = (plane.groundSpeed or 0) / 3600.0
+        track = math.radians(plane.track or 0)
+
+        # Most messages repeat the last position; dead reckoning has to run
+        # from when it was received, not from the latest message
+        fix = (plane.latitude, plane.longitude)
+        if not self._valid[row] or tuple(self._fix[row]) != fix:
+            self._fix[row] = fix
+            self._pos[row] = ((plane.longitude - self.lon) * self._lon_scale,
+                              (plane.latitude - self.lat) * NM_PER_DEG)
+            self._time[row] = now
+        if not self._valid[row] or self._alt[row] != plane.altitude:
+            self._alt[row] = plane.altitude
+            self._alt_time[row] = now
+
+        self._vel[row] = speed * math.sin(track), speed * math.cos(track)
+        self._vrate[row] = (plane.verticalRate or 0) / 60.0
+        self._valid[row] = True
+
+    def remove(self, hex_id: str) -> None:
+        row = self._rows.pop(hex_id, None)
+        if row is None:
+            return
+
+        self._valid[row] = False
+        self._hexes[row] = None
+        self._dirty.discard(row)
+        self._free.append(row)
+        self._conflicts = {k: c for k, c in self._conflicts.items()
+                           if hex_id not in k}
+
+    def evaluate(self, now: float | None = None) -> bool:
+        """Re-test every pair involving a dirty row.
+
+        Returns:
+            bool: True if the set of conflicting pairs changed
+        """
+        if not self.enabled or not self._dirty:
+            return False
+
+        now = time.monotonic() if now is None else now
+        dirty = np.fromiter(self._dirty, dtype=np.intp, count=len(self._dirty))
+        dirty_hexes = {self._hexes[i] for i in self._dirty}
+        self._dirty.clear()
+
+        before = set(self._conflicts)
+        self._conflicts = {k: c for k, c in self._conflicts.items()
+                           if k[0] not in dirty_hexes and k[1] not in dirty_hexes}
+
+        a, b = self._candidate_pairs(dirty[self._fresh(dirty, now)], now)
+        if len(a):
+            self._test_pairs(a, b, now)
+
+        return set(self._conflicts) != before
+
+    def _row_for(self, hex_id: str) -> int:
+        row = self._rows.get(hex_id)
+        if row is not None:
+            return row
+
+        if self._free:
+            row = self._free.pop()
+            self._hexes[row] = hex_id
+        else:
+            row = len(self._hexes)
+            self._hexes.append(hex_id)
+            if row >= len(self._valid):
+                self._grow()
+
+        self._rows[hex_id] = row
+        return row
+
+    def _grow(self) -> None:
+        capacity = len(self._valid) * 2
+        for name in ('_pos', '_vel', '_alt', '_vrate', '_fix', '_time',
+                     '_alt_time', '_valid'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _fresh(self, rows: np.ndarray, now: float) -> np.ndarray:
+        """Mask of rows with a position recent enough to extrapolate"""
+        return self._valid[rows] & (now - self._time[rows] <= MAX_FIX_AGE)
+
+    def _positions_at(self, rows: np.ndarray, now: float) -> np.ndarray:
+        dt = (now - self._time[rows])[:, None]
+        return self._pos[rows] + self._vel[rows] * dt
+
+    def _candidate_pairs(self, dirty: np.ndarray, now: float) -> tuple[np.ndarray, np.ndarray]:
+        """Pair each dirty row with every valid row in its 3x3 cell block"""
+        empty = np.empty(0, dtype=np.intp)
+        rows = np.arange(len(self._hexes))
+        active = rows[self._fresh(rows, now)]
+        if not len(dirty) or len(active) < 2:
+            return empty, empty
+
+        cells = np.floor(self._positions_at(active, now) /
+                         self.cell_size).astype(np.int64)
+        keys = self._cell_keys(cells[:, 0], cells[:, 1])
+        order = np.argsort(keys, kind='stable')
+        sorted_keys, sorted_rows = keys[order], active[order]
+
+        dirty_cells = np.floor(self._positions_at(dirty, now) /
+                               self.cell_size).astype(np.int64)
+
+        pairs_a, pairs_b = [], []
+        for dx, dy in _NEIGHBOURS:
+            nk = self._cell_keys(dirty_cells[:, 0] + dx, dirty_cells[:, 1] + dy)
+            lo = np.searchsorted(sorted_keys, nk, side='left')
+            hi = np.searchsorted(sorted_keys, nk, side='right')
+            counts = hi - lo
+            total = counts.sum()
+            if not total:
+                continue
+
+            # Expand each [lo, hi) range into explicit indices
+            starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+            pairs_a.append(np.repeat(dirty, counts))
+            pairs_b.append(sorted_rows[starts + np.arange(total)])
+
+        if not pairs_a:
+            return empty, empty
+
+        a, b = np.concatenate(pairs_a), np.concatenate(pairs_b)
+        a, b = np.minimum(a, b), np.maximum(a, b)
+        keep = a != b
+        a, b = a[keep], b[keep]
+
+        # Two dirty neighbours find each other twice
+        unique = np.unique(a.astype(np.int64) * len(self._valid) + b)
+        return unique // len(self._valid), unique % len(self._valid)
+
+    def _test_pairs(self, a: np.ndarray, b: np.ndarray, now: float) -> None:
+        pos_a, pos_b = self._positions_at(a, now), self._positions_at(b, now)
+        dp = pos_b - pos_a
+        dv = self._vel[b] - self._vel[a]
+
+        dv2 = np.einsum('ij,ij->i', dv, dv)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = -np.einsum('ij,ij->i', dp, dv) / dv2
+        t = np.clip(np.nan_to_num(t, nan=0.0), 0.0, self.lookahead)
+
+        lateral = np.linalg.norm(dp + dv * t[:, None], axis=1)
+
+        alt_a = self._alt[a] + self._vrate[a] * (now - self._alt_time[a] + t)
+        alt_b = self._alt[b] + self._vrate[b] * (now - self._alt_time[b] + t)
+        vertical = np.abs(alt_b - alt_a)
+
+        hits = np.flatnonzero((lateral < self.lateral) &
+                              (vertical < self.vertical))
+        for i in hits:
+            hex_a, hex_b = sorted((self._hexes[a[i]], self._hexes[b[i]]))
+            self._conflicts[(hex_a, hex_b)] = Conflict(
+                hex_a, hex_b, float(t[i]), float(lateral[i]), float(vertical[i]))
+
+    @staticmethod
+    def _cell_keys(cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+        return (cx + _CELL_OFFSET) * _CELL_SHIFT + (cy + _CELL_OFFSET)
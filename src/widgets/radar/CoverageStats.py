@@ -0,0 +1,172 @@
+import math
+import os
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.utils.settings import CoverageSettings
+
+NM_PER_DEG = 60.0
+
+# Index of each message type in the rate accumulator. New types are only
+# appended so saved counts keep their meaning; BEAST holds Beast frames
+# counted before they were split by downlink format and type code.
+MESSAGE_TYPES = ["MSG,1", "MSG,2", "MSG,3", "MSG,4", "MSG,5", "MSG,6",
+                 "MSG,7", "MSG,8", "SEL", "ID", "STA", "AIR", "CLK",
+                 "BEAST", "OTHER",
+                 "DF4", "DF5", "DF20", "DF21", "ES ident", "ES surface",
+                 "ES airborne", "ES velocity", "ES emergency"]
+_TYPE_INDEX = {name: i for i, name in enumerate(MESSAGE_TYPES)}
+
+
+class CoverageStats:
+    """Receiver coverage and traffic statistics.
+
+    Everything lives in fixed-size NumPy accumulators so each message is
+    an O(1) update: a range/bearing histogram, the furthest position seen
+    per bearing sector, message counts per type and distinct aircraft per
+    hour of day. The accumulators are saved to disk periodically and reloaded
+    on start if the receiver hasn't moved.
+    """
+
+    def __init__(self, lat: float, lon: float,
+                 settings: CoverageSettings = CoverageSettings()):
+        self.lat = lat
+        self.lon = lon
+        self._lon_scale = NM_PER_DEG * math.cos(math.radians(lat))
+
+        self.path = settings.path
+        self.save_interval = settings.save_interval
+        self.max_range = settings.max_range
+        self.sectors = settings.sectors
+        range_bins = settings.range_bins
+        self.range_step = self.max_range / range_bins
+
+        self.polar = np.zeros((self.sectors, range_bins), dtype=np.int64)
+        self.sector_range = np.zeros(self.sectors, dtype=np.float64)  # nm
+        self.messages = np.zeros(len(MESSAGE_TYPES), dtype=np.int64)
+        self._rate_base = self.messages.copy()
+        self.hour_totals = np.zeros(24, dtype=np.int64)
+        self.hour_samples = np.zeros(24, dtype=np.int64)
+
+        self._hour_aircraft: set[str] = set()
+        self._start_hour()
+        self._last_save = time.monotonic()
+        self.changed = False  # Coverage polygon grew since last `take_changed`
+
+        self.load()
+
+    def record_message(self, message_type: str, hex_id: str) -> None:
+        self.messages[_TYPE_INDEX.get(message_type, _TYPE_INDEX["OTHER"])] += 1
+
+        if time.monotonic() >= self._hour_end:
+            self._end_hour(len(self._hour_aircraft))
+            self._start_hour()
+        self._hour_aircraft.add(hex_id)
+
+    def _start_hour(self) -> None:
+        # Wall clock is only read here; messages compare a monotonic deadline
+        now = datetime.now()
+        start = now.replace(minute=0, second=0, microsecond=0)
+        self._hour = now.hour
+        self._hour_start = start.timestamp()
+        self._hour_end = (time.monotonic() +
+                          (start + timedelta(hours=1) - now).total_seconds())
+        self._hour_aircraft.clear()
+
+    def _end_hour(self, count: int, hour: int | None = None) -> None:
+        hour = self._hour if hour is None else hour
+        self.hour_totals[hour] += count
+        self.hour_samples[hour] += 1
+
+    def record_position(self, lat: float, lon: float) -> None:
+        dx = (lon - self.lon) * self._lon_scale
+        dy = (lat - self.lat) * NM_PER_DEG
+        distance = math.hypot(dx, dy)
+        if distance >= self.max_range:
+            # Almost certainly a bad decode
+            return
+
+        bearing = math.degrees(math.atan2(dx, dy)) % 360
+        sector = int(bearing * self.sectors / 360) % self.sectors
+        self.polar[sector, int(distance / self.range_step)] += 1
+
+        if distance > self.sector_range[sector]:
+            self.sector_range[sector] = distance
+            self.changed = True
+
+    def take_rates(self) -> dict[str, int]:
+        """Messages of each type since the last call"""
+        delta = self.messages - self._rate_base
+        self._rate_base = self.messages.copy()
+        return {MESSAGE_TYPES[i]: int(n) for i, n in enumerate(delta) if n}
+
+    def take_changed(self) -> bool:
+        changed, self.changed = self.changed, False
+        return changed
+
+    def coverage_polygon(self) -> list[tuple[float, float]]:
+        """Furthest position per sector as (lat, lon) offsets in degrees"""
+        bearings = np.radians((np.arange(self.sectors) + 0.5) * 360 / self.sectors)
+        dlat = self.sector_range * np.cos(bearings) / NM_PER_DEG
+        dlon = self.sector_range * np.sin(bearings) / self._lon_scale
+        return list(zip(dlat.tolist(), dlon.tolist()))
+
+    def hourly_average(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.nan_to_num(self.hour_totals / self.hour_samples)
+
+    def maybe_save(self) -> None:
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def save(self) -> None:
+        self._last_save = time.monotonic()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = self.path + '.tmp.npz'
+        np.savez(tmp_path, origin=np.array([self.lat, self.lon]),
+                 polar=self.polar, sector_range=self.sector_range,
+                 messages=self.messages, hour_totals=self.hour_totals,
+                 hour_samples=self.hour_samples,
+                 # The hour in progress, so a restart can carry on counting
+                 hour=np.array(self._hour), hour_start=np.array(self._hour_start),
+                 hour_aircraft=np.array(sorted(self._hour_aircraft), dtype=str))
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with np.load(self.path) as saved:
+                origin = saved['origin']
+                # Coverage belongs to a site; start over if we moved ~1 km
+                if np.abs(origin - (self.lat, self.lon)).max() > 0.01:
+                    print("Receiver moved, starting new coverage statistics")
+                    return
+                if saved['polar'].shape != self.polar.shape:
+                    print("Coverage bins changed, starting new coverage statistics")
+                    return
+
+                self.polar[:] = saved['polar']
+                self.sector_range[:] = saved['sector_range']
+                count = min(len(saved['messages']), len(self.messages))
+                self.messages[:count] = saved['messages'][:count]
+                self._rate_base = self.messages.copy()
+                self.hour_totals[:] = saved['hour_totals']
+                self.hour_samples[:] = saved['hour_samples']
+                self.changed = True
+
+                if 'hour_aircraft' in saved.files:
+                    aircraft = set(saved['hour_aircraft'].tolist())
+                    if float(saved['hour_start']) == self._hour_start:
+                        self._hour_aircraft |= aircraft
+                    elif aircraft:
+                        # The last session stopped partway through that hour
+                        self._end_hour(len(aircraft), int(saved['hour']))
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Ignoring coverage statistics {self.path}: {e}")
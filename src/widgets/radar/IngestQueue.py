@@ -0,0 +1,129 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+# Priority classes, highest first. Positions and squawk/emergency updates
+# are never shed, all-call replies and air-to-air altitude go first.
+KEEP, NORMAL, REDUNDANT = 0, 1, 2
+PRIORITY_NAMES = ("keep", "normal", "redundant")
+
+KEEP_TYPES = {"2", "3", "6"}
+REDUNDANT_TYPES = {"7", "8"}
+
+
+def classify(transmission_type: str, message_type: str) -> int:
+    if transmission_type != "MSG":
+        return NORMAL
+    if message_type in KEEP_TYPES:
+        return KEEP
+    if message_type in REDUNDANT_TYPES:
+        return REDUNDANT
+    return NORMAL
+
+
+@dataclass
+class IngestStats:
+    received: int = 0
+    coalesced: int = 0  # Replaced by a newer message of the same key
+    shed: list[int] = field(default_factory=lambda: [0, 0, 0])  # Per class
+    max_depth: int = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "shed": dict(zip(PRIORITY_NAMES, self.shed)),
+            "max_depth": self.max_depth,
+        }
+
+
+class IngestQueue:
+    """Bounded, coalescing queue of SBS lines between socket and parser.
+
+    Lines are keyed by (hex ident, message type), so a newer message
+    replaces a queued one and the queue never holds more than one message
+    of each type per aircraft. Lines are handed out in arrival order, a
+    replaced one taking the place of the newer message, so an aircraft's
+    updates are never applied out of order. Priority only decides what is
+    dropped: past `high_water` redundant types are dropped on arrival, and
+    at `capacity` the oldest line of a lower class is evicted to make room.
+    KEEP lines are never dropped, so the queue can exceed capacity by up to
+    three lines (MSG,2, 3 and 6) per aircraft.
+    """
+
+    def __init__(self, capacity: int = 5000, high_water: float = 0.5):
+        self._high_water_ratio = high_water
+        self.resize(capacity)
+        self.stats = IngestStats()
+
+        # Every queued line in arrival order, plus the keys of each class in
+        # the same order to find eviction candidates
+        self._lines: OrderedDict[tuple, tuple[int, str]] = OrderedDict()
+        self._classes: list[OrderedDict] = [OrderedDict() for _ in PRIORITY_NAMES]
+        self._ready = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def resize(self, capacity: int) -> None:
+        """Change the bound; a shrunk queue drains back under it naturally"""
+        self.capacity = capacity
+        self.high_water = int(capacity * self._high_water_ratio)
+
+    def put(self, line: str) -> None:
+        fields = line.split(",", 5)
+        if len(fields) < 5:
+            return
+
+        priority = classify(fields[0], fields[1])
+        key = (fields[4], fields[0], fields[1])
+
+        with self._ready:
+            self.stats.received += 1
+
+            if key in self._lines:
+                self._lines[key] = priority, line
+                self._lines.move_to_end(key)
+                self._classes[priority].move_to_end(key)
+                self.stats.coalesced += 1
+                return
+
+            size = len(self._lines)
+            if priority == REDUNDANT and size >= self.high_water:
+                self.stats.shed[REDUNDANT] += 1
+                return
+
+            if size >= self.capacity and not self._make_room(priority):
+                self.stats.shed[priority] += 1
+                return
+
+            self._lines[key] = priority, line
+            self._classes[priority][key] = None
+            self.stats.max_depth = max(self.stats.max_depth, len(self._lines))
+            self._ready.notify()
+
+    def _make_room(self, priority: int) -> bool:
+        """Evict the oldest line of a lower class, lowest class first"""
+        for lower in (REDUNDANT, NORMAL):
+            if lower <= priority:
+                break
+            if self._classes[lower]:
+                key, _ = self._classes[lower].popitem(last=False)
+                del self._lines[key]
+                self.stats.shed[lower] += 1
+                return True
+
+        return priority == KEEP
+
+    def get_batch(self, max_items: int = 500, timeout: float = 0.2) -> list[str]:
+        """Pop up to `max_items` lines, oldest first"""
+        with self._ready:
+            if not self._lines:
+                self._ready.wait(timeout)
+
+            batch = []
+            while self._lines and len(batch) < max_items:
+                key, (priority, line) = self._lines.popitem(last=False)
+                del self._classes[priority][key]
+                batch.append(line)
+            return batch
@@ -43,6 +43,12 @@ class Plane:
     longitude: float | None = None
     verticalRate: int | None = None
     squawk: str | None = None
+    rssi: float | None = None  # dBFS, Beast input only
+
+    # From the offline aircraft database, see src/utils/aircraft_db.py
+    registration: str | None = None
+    aircraftType: str | None = None
+    operator: str | None = None
 
     # Flags
     alert: bool = False
@@ -137,9 +143,23 @@ class Plane:
         self.lastLogUpdate = datetime.strptime(
             f"{logDate} {logTime}000", "%Y/%m/%d %H:%M:%S.%f")
 
-    def generate_widget(self) -> QWidget:
+    def apply(self, fields: dict) -> None:
+        """Update from already decoded values, e.g. from BeastDecoder
+
+        Args:
+            fields (dict): Attribute names of this class mapped to new values
+        """
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+        self.lastGenUpdate = self.lastLogUpdate = datetime.now()
+
+    def generate_widget(self, alert: bool = False) -> QWidget:
         small_text_style = "font-size: 8px;"
         card = QWidget()
+        if alert:
+            # Traffic conflict, see ConflictDetector
+            card.setStyleSheet("color: #ff5050;")
         layout = QHBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
         # Info area (callsign, alt, heading, lat/lon, heading, squawk(?))
@@ -161,6 +181,11 @@ class Plane:
         gs_label.setStyleSheet(small_text_style)
 
         top_info_layout.addWidget(callsign_label)
+        if self.registration or self.aircraftType:
+            airframe_label = QLabel(
+                f" {self.registration or ''} {self.aircraftType or ''}")
+            airframe_label.setStyleSheet(small_text_style)
+            top_info_layout.addWidget(airframe_label)
         top_info_layout.addStretch()
         top_info_layout.addWidget(alt_label)
         top_info_layout.addWidget(gs_label)
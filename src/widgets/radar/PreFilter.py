@@ -0,0 +1,52 @@
+from src.utils.settings import FilterSettings
+
+
+class SBSPreFilter:
+    """Drops raw SBS lines by prefix before they are decoded or split.
+
+    The message type check is a single `bytes.startswith` against the
+    allowed prefixes. The hex ident is only cut out when a watchlist or
+    ignore list is configured.
+    """
+
+    def __init__(self, types: list[str], watchlist: list[str] | None = None,
+                 ignore: list[str] | None = None):
+        # "MSG,3" must not match "MSG,30", so every prefix ends in a comma
+        self.prefixes = tuple(t.encode() + b"," for t in types)
+        self.watchlist = {h.upper().encode() for h in watchlist or []}
+        self.ignore = {h.upper().encode() for h in ignore or []}
+        self._check_hex = bool(self.watchlist or self.ignore)
+
+        self.seen = 0
+        self.dropped_type = 0
+        self.dropped_hex = 0
+
+    @classmethod
+    def from_settings(cls, settings: FilterSettings) -> "SBSPreFilter":
+        return cls(list(settings.types), list(settings.watchlist),
+                   list(settings.ignore))
+
+    def accept(self, line: bytes) -> bool:
+        self.seen += 1
+
+        if not line.startswith(self.prefixes):
+            self.dropped_type += 1
+            return False
+
+        if self._check_hex:
+            fields = line.split(b",", 5)
+            hex_id = fields[4] if len(fields) > 4 else b""
+            if (self.watchlist and hex_id not in self.watchlist) or hex_id in self.ignore:
+                self.dropped_hex += 1
+                return False
+
+        return True
+
+    def snapshot(self) -> dict:
+        seen = self.seen or 1
+        return {
+            "seen": self.seen,
+            "dropped_type": self.dropped_type,
+            "dropped_hex": self.dropped_hex,
+            "hit_rate": (self.dropped_type + self.dropped_hex) / seen,
+        }
@@ -1,27 +1,29 @@
-import configparser
+import math
 import socket
 from typing import Dict
 
 from PySide6.QtCore import Qt, QThread, Slot
 from src.gl.GLGeometry import GLPrimitives
 from src.gl.BaseOpenGLWidget import BaseOpenGLWidget
+from src.gl.MapLayer import MapLayer
+from src.utils.settings import Settings
 from OpenGL.GL import glDisable, glEnable, GL_LINE_SMOOTH
 
 from src.widgets.radar.Plane import Plane
 from src.widgets.radar.ADSBSocketWorker import ADSBSocketWorker
-
-config = configparser.ConfigParser()
-config.read('config.ini')
+from src.widgets.radar.ConflictDetector import Conflict
 
 
 class RadarScopeGL(BaseOpenGLWidget):
-    def __init__(self, lat: float, lon: float):
-        super().__init__(animated=True)
+    def __init__(self, lat: float, lon: float, settings: Settings = Settings()):
+        super().__init__(animated=True, gui=settings.gui)
         self.lat = lat
         self.lon = lon
+        self.settings = settings
 
         self.setMinimumSize(600, 600)
         self.planes = {}
+        self.conflicts: list[Conflict] = []
 
         self.sweep_angle = 0.0
         self.circle = None
@@ -29,18 +31,79 @@ class RadarScopeGL(BaseOpenGLWidget):
 
         self.plane_icon = None
 
+        # Rebuilt lazily inside paintGL, where the GL context is current
+        self.coverage_points: list[tuple[float, float]] = []
+        self.coverage_outline = None
+        self._coverage_dirty = False
+
+        self.map_layer = MapLayer(lat, lon, settings.map)
+        self.map_layer.load()
+
+    @Slot(object)
+    def apply_settings(self, settings: Settings):
+        """Apply a reloaded config, rebuilding only what depends on it"""
+        changed = settings.changed_sections(self.settings)
+        self.settings = settings
+
+        if 'gui' in changed:
+            self.apply_gui(settings.gui)
+
+        if 'map' in changed:
+            if self.isValid():
+                self.makeCurrent()
+                self.map_layer.destroy()
+                self.doneCurrent()
+            self.map_layer = MapLayer(self.lat, self.lon, settings.map)
+            self.map_layer.load()
+
+        # Rings, map scale and coverage outline all depend on the radius
+        if changed & {'radar', 'map'}:
+            self.invalidate_static_layer()
+        if changed & {'radar', 'gui'}:
+            self.update_planes(list(self.planes.values()))
+
     @Slot(dict)
     def handle_socket_update(self, updated_planes):
         self.planes = updated_planes
         self.update_planes(list(self.planes.values()))
 
+    @Slot(list)
+    def handle_conflict_update(self, conflicts):
+        self.conflicts = conflicts
+        self.update_planes(list(self.planes.values()))
+
+    @Slot(list)
+    def handle_coverage_update(self, points):
+        self.coverage_points = points
+        self._coverage_dirty = True
+
+    def rebuild_coverage(self):
+        self._coverage_dirty = False
+        if self.coverage_outline:
+            self.coverage_outline.destroy()
+        self.coverage_outline = GLPrimitives.polygon(
+            [(dlon, dlat) for dlat, dlon in self.coverage_points])
+
     def init_geometry(self):
         self.circle = GLPrimitives.circle()
         self.plane_icon = GLPrimitives.circle(disc=True)
         self.line = GLPrimitives.line(0, 0, 1, 0)
 
     def init_static_layer(self):
-        r, h = 0, 1/(config.getint('RADAR', 'ring_count') + 1)
+        radius = self.settings.radar.radius
+        if not self.map_layer.empty:
+            self.add_map_layer(radius)
+
+        # Furthest position ever received per bearing sector
+        def draw_coverage(w):
+            if self._coverage_dirty:
+                self.rebuild_coverage()
+            if self.coverage_outline:
+                w.set_color(0.15, 0.45, 0.25, 0.8)
+                w.draw_at(self.coverage_outline, scale=1 / radius)
+        self.static_layer.add(draw_coverage, z_order=0)
+
+        r, h = 0, 1/(self.settings.radar.ring_count + 1)
         while r < 1:
             def draw_ring(w, radius=r):
                 glDisable(GL_LINE_SMOOTH)
@@ -56,25 +119,51 @@ class RadarScopeGL(BaseOpenGLWidget):
             w.draw_at(self.line, scale=0.85, rotation=self.sweep_angle)
         self.static_layer.add(draw_sweep, z_order=1)
 
+    def add_map_layer(self, radius: float):
+        level = MapLayer.level_for(radius)
+        fill = self.map_layer.geometry('triangles', level)
+        outline = self.map_layer.geometry('lines', level)
+
+        # Map vertices are relative to the layer's anchor, not our origin
+        anchor_lat, anchor_lon = self.map_layer.anchor
+        x, y = (anchor_lon - self.lon) / radius, (anchor_lat - self.lat) / radius
+
+        def draw_map(w):
+            if fill:
+                w.set_color(0.04, 0.08, 0.06, 1.0)
+                w.draw_at(fill, x=x, y=y, scale=1 / radius)
+            if outline:
+                w.set_color(0.18, 0.3, 0.28, 1.0)
+                w.draw_at(outline, x=x, y=y, scale=1 / radius)
+        self.static_layer.add(draw_map, z_order=-1)
+
     def tick(self, delta: float):
         self.sweep_angle = (self.sweep_angle + 90.0 * delta) % 360
 
     def update_planes(self, planes: list):
         if not self.plane_icon: return
 
-        r = config.getfloat('RADAR', 'radius')
+        r = self.settings.radar.radius
         origin_lat, origin_lon = self.lat, self.lon
         self.dynamic_layer.clear()
         self.clear_texts()
 
+        positions = {}
+        in_conflict = {h for c in self.conflicts for h in (c.hex_a, c.hex_b)}
+
         for plane in planes:
             if plane.latitude is None or plane.longitude is None: continue
 
             gl_x = (plane.longitude - origin_lon) / r
             gl_y = (plane.latitude - origin_lat) / r
-
-            def draw_plane(w, x=gl_x, y=gl_y):
-                w.set_color(0.0, 0.9, 0.9, 1.0)
+            positions[plane.hexIdent] = gl_x, gl_y
+            alert = plane.hexIdent in in_conflict
+
+            def draw_plane(w, x=gl_x, y=gl_y, alert=alert):
+                if alert:
+                    w.set_color(1.0, 0.3, 0.3, 1.0)
+                else:
+                    w.set_color(0.0, 0.9, 0.9, 1.0)
                 w.draw_at(self.plane_icon, x=x, y=y, scale=0.02)
             
             self.dynamic_layer.add(draw_plane, z_order=10)
@@ -84,7 +173,22 @@ class RadarScopeGL(BaseOpenGLWidget):
                 callsign,
                 x=gl_x + 0.03,
                 y=gl_y + 0.02,
-                color=(0, 230, 230),
+                color=(255, 80, 80) if alert else (0, 230, 230),
                 align=Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
                 z_order=-1,
             )
+
+        # Link each conflicting pair with a line from a to b
+        for conflict in self.conflicts:
+            if conflict.hex_a not in positions or conflict.hex_b not in positions:
+                continue
+
+            (ax, ay), (bx, by) = positions[conflict.hex_a], positions[conflict.hex_b]
+            length = math.hypot(bx - ax, by - ay)
+            angle = math.degrees(math.atan2(by - ay, bx - ax))
+
+            def draw_link(w, x=ax, y=ay, scale=length, rotation=angle):
+                w.set_color(1.0, 0.3, 0.3, 0.8)
+                w.draw_at(self.line, x=x, y=y, scale=scale, rotation=rotation)
+
+            self.dynamic_layer.add(draw_link, z_order=9)